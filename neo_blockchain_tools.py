@@ -4,15 +4,19 @@ Complete Neo N3 API toolkit integrated directly into the main agent
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import orjson
 import os
 import getpass
-from typing import Annotated, Any, Dict, List, Optional
-from decimal import Decimal
-from datetime import datetime
+import functools
+from typing import Annotated, Any, Callable, Dict, List, Optional, Tuple
 import asyncio
 import aiohttp
 import logging
+import re
+import time
 
 # Neo3 imports
 try:
@@ -24,10 +28,79 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Powers of ten for scaling raw integer token amounts
+_POW10 = tuple(10 ** i for i in range(40))
+
+# Neo N3 address shape: 'N' followed by 33 base58 characters
+_NEO_ADDR_RE = re.compile(r'N[1-9A-HJ-NP-Za-km-z]{33}')
+
+@functools.lru_cache(maxsize=4096)
+def _is_valid_neo_address(address: str) -> bool:
+    """Check Neo address shape, then its base58 checksum (requires neo3)."""
+    return bool(_NEO_ADDR_RE.fullmatch(address)) and neo3.wallet.utils.is_valid_address(address)
+
+@functools.lru_cache(maxsize=4096)
+def _address_to_script_hash(address: str) -> str:
+    """Convert Neo address to script hash; addresses are immutable so results are memoized."""
+    if NEO3_AVAILABLE and _is_valid_neo_address(address):
+        return "0x" + neo3.wallet.utils.address_to_script_hash(address=address).__str__()
+    return address
+
+def format_timestamp(timestamp_ms: int) -> str:
+    """Format an epoch-milliseconds timestamp as local 'YYYY-MM-DD HH:MM:SS'."""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp_ms / 1000))
+
+def _async_ttl_cache(ttl: float, cacheable: Optional[Callable[[Any], bool]] = None):
+    """Cache an async NeoAPIClient method per arguments for ttl seconds; concurrent misses share one call."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args):
+            key = (func.__name__, args)
+            cached = self._ttl_cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            
+            lock = self._ttl_locks.get(key)
+            if lock is None:
+                lock = self._ttl_locks[key] = asyncio.Lock()
+            async with lock:
+                # Another caller may have refreshed the entry while we waited
+                cached = self._ttl_cache.get(key)
+                if cached and cached[0] > time.monotonic():
+                    return cached[1]
+                result = await func(self, *args)
+                # Results rejected by cacheable (error fallbacks) are returned but not stored
+                if cacheable is None or cacheable(result):
+                    self._ttl_cache[key] = (time.monotonic() + ttl, result)
+                return result
+        return wrapper
+    return decorator
+
+# Per-request timeout for async RPCs, also applied on shared sessions
+_RPC_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+# GoPlusLabs address_security fields that mark an address as malicious
+_MALICIOUS_FLAGS = (
+    "blacklist_doubt", "blackmail_activities", "cybercrime",
+    "darkweb_transactions", "financial_crime", "fake_token",
+    "honeypot_related_address", "malicious_mining_activities",
+    "mixer", "money_laundering", "phishing_activities", "stealing_attack"
+)
+
 class NeoAPIClient:
     """Complete Neo N3 API client for blockchain operations."""
     
-    def __init__(self, network: str = "testnet"):
+    # Maximum number of calls sent in one JSON-RPC batch
+    MAX_BATCH_SIZE = 20
+    
+    # Asset metadata (symbol, decimals) rarely changes, cache it for an hour
+    ASSET_INFO_TTL = 3600
+    
+    # Deployed contract info is cached briefly to serve repeated NFT/collection lookups
+    CONTRACT_INFO_TTL = 600
+    CONTRACT_CACHE_SIZE = 256
+    
+    def __init__(self, network: str = "testnet", session: Optional[aiohttp.ClientSession] = None):
         self.mainnet_url = "https://explorer.onegate.space/api"
         self.testnet_url = "https://testmagnet.explorer.onegate.space/api"
         
@@ -38,6 +111,82 @@ class NeoAPIClient:
         self.NEO_CONTRACT = "0xef4073a0f2b305a38ec4050e4d3d28bc40ea63f5"
         self.GAS_CONTRACT = "0xd2a4cff31913016155e38e474a2c06d08be276cf"
         
+        # Symbol and decimals of native assets, resolved without asset info RPCs
+        self._KNOWN_ASSETS: Dict[str, Tuple[str, int]] = {
+            self.NEO_CONTRACT: ("NEO", 0),
+            self.GAS_CONTRACT: ("GAS", 8)
+        }
+        
+        # Pooled keep-alive session so repeated RPCs reuse the TCP/TLS connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            # Retry connect errors and gateway statuses only; retrying read timeouts
+            # would let one slow RPC block for several full read timeouts
+            max_retries=Retry(
+                total=2,
+                read=0,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=frozenset({"POST"})
+            )
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # Payloads are pre-encoded with orjson, so declare the body type once
+        self._session.headers["Content-Type"] = "application/json"
+        
+        # aiohttp session for the async API; an injected session is shared and
+        # left open by aclose(), otherwise one is created on first use
+        self._async_session = session
+        self._owns_async_session = session is None
+        
+        # Asset info cache: contract hash -> (expires_at, info); NEO/GAS never expire
+        self._asset_info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {
+            asset_hash: (float("inf"), {"hash": asset_hash, "symbol": symbol, "decimals": decimals})
+            for asset_hash, (symbol, decimals) in self._KNOWN_ASSETS.items()
+        }
+        
+        # Contract info cache: contract hash -> (expires_at, response)
+        self._contract_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        
+        # Short-lived cache for chain-state RPCs: (method, args) -> (expires_at, result)
+        self._ttl_cache: Dict[Tuple[str, Tuple], Tuple[float, Any]] = {}
+        self._ttl_locks: Dict[Tuple[str, Tuple], asyncio.Lock] = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    def close(self):
+        """Close pooled HTTP connections."""
+        self._session.close()
+    
+    async def aclose(self):
+        """Close the async HTTP session if this client created it."""
+        if self._owns_async_session and self._async_session and not self._async_session.closed:
+            await self._async_session.close()
+            self._async_session = None
+    
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        """Get the shared aiohttp session, creating it inside the running loop if needed."""
+        if self._async_session is None or self._async_session.closed:
+            self._owns_async_session = True
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._async_session
+        
     def _make_request(self, method: str, params: Dict = None) -> Dict[str, Any]:
         """Make RPC request to Neo API."""
         payload = {
@@ -48,27 +197,142 @@ class NeoAPIClient:
         }
         
         try:
-            response = requests.post(self.url, json=payload, timeout=30)
-            return response.json()
+            response = self._session.post(self.url, data=orjson.dumps(payload), timeout=(5, 30))
+            return orjson.loads(response.content)
         except Exception as e:
             logger.error(f"API request failed: {e}")
             return {"error": str(e)}
     
+    async def _arequest(self, method: str, params: Dict = None) -> Dict[str, Any]:
+        """Make async RPC request to Neo API; timeouts and connection errors are raised."""
+        payload = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or {},
+            "id": 1
+        }
+        
+        try:
+            async with self._get_async_session().post(
+                self.url,
+                data=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
+                timeout=_RPC_TIMEOUT
+            ) as response:
+                return orjson.loads(await response.read())
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            # Transport failures propagate so handlers can report timeouts and outages
+            logger.error(f"Async API request failed: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Async API request failed: {e}")
+            return {"error": str(e)}
+    
+    def _make_batch_request(self, calls: List[Tuple[str, Dict]]) -> List[Dict[str, Any]]:
+        """Make JSON-RPC batch requests, returning one result per call in call order."""
+        results = []
+        
+        for start in range(0, len(calls), self.MAX_BATCH_SIZE):
+            chunk = calls[start:start + self.MAX_BATCH_SIZE]
+            payload = [
+                {"jsonrpc": "2.0", "method": method, "params": params or {}, "id": start + i}
+                for i, (method, params) in enumerate(chunk)
+            ]
+            
+            try:
+                response = self._session.post(self.url, data=orjson.dumps(payload), timeout=(5, 30))
+                replies = orjson.loads(response.content)
+            except Exception as e:
+                logger.error(f"API batch request failed: {e}")
+                results.extend({"error": str(e)} for _ in chunk)
+                continue
+            
+            if not isinstance(replies, list):
+                # Endpoint does not accept batches, fall back to individual requests
+                results.extend(self._make_request(method, params) for method, params in chunk)
+                continue
+            
+            results.extend(self._order_batch_replies(replies, start, len(chunk)))
+        
+        return results
+    
+    async def abatch_call(self, calls: List[Tuple[str, Dict]]) -> List[Dict[str, Any]]:
+        """Make async JSON-RPC batch requests, returning one result per call in call order."""
+        results = []
+        
+        for start in range(0, len(calls), self.MAX_BATCH_SIZE):
+            chunk = calls[start:start + self.MAX_BATCH_SIZE]
+            payload = [
+                {"jsonrpc": "2.0", "method": method, "params": params or {}, "id": start + i}
+                for i, (method, params) in enumerate(chunk)
+            ]
+            
+            try:
+                async with self._get_async_session().post(
+                    self.url,
+                    data=orjson.dumps(payload),
+                    headers={"Content-Type": "application/json"},
+                    timeout=_RPC_TIMEOUT
+                ) as response:
+                    replies = orjson.loads(await response.read())
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                logger.error(f"Async API batch request failed: {e}")
+                raise
+            except Exception as e:
+                logger.error(f"Async API batch request failed: {e}")
+                results.extend({"error": str(e)} for _ in chunk)
+                continue
+            
+            if not isinstance(replies, list):
+                # Endpoint does not accept batches, fall back to concurrent individual requests
+                results.extend(await asyncio.gather(*(self._arequest(method, params) for method, params in chunk)))
+                continue
+            
+            results.extend(self._order_batch_replies(replies, start, len(chunk)))
+        
+        return results
+    
+    @staticmethod
+    def _order_batch_replies(replies: List[Any], start: int, count: int) -> List[Dict[str, Any]]:
+        """Match batch replies to request ids start..start+count-1."""
+        # Batch replies may come back in any order, so match them by id
+        by_id = {reply.get("id"): reply for reply in replies if isinstance(reply, dict)}
+        return [by_id.get(start + i, {"error": "Missing batch response"}) for i in range(count)]
+    
+    def _get_cached_asset_info(self, asset_hash: str) -> Optional[Dict[str, Any]]:
+        """Get unexpired asset info from the cache."""
+        cached = self._asset_info_cache.get(asset_hash)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        return None
+    
+    def _cache_asset_info(self, asset_hash: str, asset_info: Any):
+        """Cache asset info if it is a complete asset record."""
+        if isinstance(asset_info, dict) and "symbol" in asset_info:
+            self._asset_info_cache[asset_hash] = (time.monotonic() + self.ASSET_INFO_TTL, asset_info)
+    
     def convert_address_to_script_hash(self, address: str) -> str:
         """Convert Neo address to script hash."""
-        if NEO3_AVAILABLE and neo3.wallet.utils.is_valid_address(address):
-            return "0x" + neo3.wallet.utils.address_to_script_hash(address=address).__str__()
-        return address
+        return _address_to_script_hash(address)
     
     def convert_asset_amount_string(self, amount_str: str, decimals: int) -> str:
         """Convert raw asset amount to human readable format."""
-        try:
-            amount = Decimal(amount_str)
-            divisor = Decimal(10) ** decimals
-            result = amount / divisor
-            return str(result)
-        except:
+        if isinstance(amount_str, int):
+            amount = amount_str
+        elif amount_str and (amount_str[1:] if amount_str.startswith("-") else amount_str).isdecimal():
+            amount = int(amount_str)
+        else:
             return "0"
+        
+        if decimals <= 0:
+            return str(amount)
+        
+        divisor = _POW10[decimals] if decimals < len(_POW10) else 10 ** decimals
+        whole, fraction = divmod(abs(amount), divisor)
+        sign = "-" if amount < 0 else ""
+        if not fraction:
+            return f"{sign}{whole}"
+        return f"{sign}{whole}.{fraction:0{decimals}d}".rstrip("0")
     
     # === Address Information ===
     def get_address_info(self, address: str) -> Dict[str, Any]:
@@ -80,8 +344,9 @@ class NeoAPIClient:
             data = result["result"]
             return {
                 "address": data.get("address"),
-                "first_use_time": datetime.fromtimestamp(data.get("firstusetime", 0) / 1000).strftime('%Y-%m-%d %H:%M:%S'),
-                "last_use_time": datetime.fromtimestamp(data.get("lastusetime", 0) / 1000).strftime('%Y-%m-%d %H:%M:%S'),
+                # Raw epoch ms; render with format_timestamp() when displayed
+                "first_use_time_ms": data.get("firstusetime", 0),
+                "last_use_time_ms": data.get("lastusetime", 0),
                 "transactions_sent": data.get("transactionssent", 0)
             }
         return result
@@ -93,36 +358,115 @@ class NeoAPIClient:
         
         if "result" in result and "result" in result["result"]:
             assets = result["result"]["result"]
-            processed_assets = []
             
-            for asset in assets:
-                asset_hash = asset.get("asset")
-                balance_raw = asset.get("balance", "0")
-                
-                # Get asset info for decimals and symbol
-                asset_info = self.get_asset_info_by_hash(asset_hash)
-                if isinstance(asset_info, dict) and "symbol" in asset_info:
-                    decimals = int(asset_info.get("decimals", 0))
-                    symbol = asset_info.get("symbol", "UNKNOWN")
-                    balance_formatted = self.convert_asset_amount_string(balance_raw, decimals)
-                    
-                    processed_assets.append({
-                        "symbol": symbol,
-                        "balance": balance_formatted,
-                        "raw_balance": balance_raw,
-                        "contract_hash": asset_hash,
-                        "decimals": decimals
-                    })
+            # Get asset info for decimals and symbol, batching only cache misses
+            asset_infos, missing_hashes = self._split_cached_asset_infos(assets)
+            info_results = self._make_batch_request([
+                ("GetAssetInfoByContractHash", {"ContractHash": asset_hash})
+                for asset_hash in missing_hashes
+            ])
+            self._merge_asset_info_results(asset_infos, missing_hashes, info_results)
             
-            return {"assets": processed_assets}
+            return {"assets": self._format_assets(assets, asset_infos)}
         
         return result
     
+    async def aget_assets_by_address(self, address: str) -> Dict[str, Any]:
+        """Get all assets held by an address (async)."""
+        script_hash = self.convert_address_to_script_hash(address)
+        result = await self._arequest("GetAssetsHeldByAddress", {"Address": script_hash})
+        
+        if "result" in result and "result" in result["result"]:
+            assets = result["result"]["result"]
+            
+            # Resolve asset info cache misses concurrently
+            asset_infos, missing_hashes = self._split_cached_asset_infos(assets)
+            info_results = await asyncio.gather(*(
+                self._arequest("GetAssetInfoByContractHash", {"ContractHash": asset_hash})
+                for asset_hash in missing_hashes
+            ))
+            self._merge_asset_info_results(asset_infos, missing_hashes, info_results)
+            
+            return {"assets": self._format_assets(assets, asset_infos)}
+        
+        return result
+    
+    def _split_cached_asset_infos(self, assets: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[str]]:
+        """Resolve asset infos from the cache, returning them with the uncached hashes."""
+        asset_infos = {}
+        missing_hashes = []
+        for asset in assets:
+            asset_hash = asset.get("asset")
+            if asset_hash in asset_infos or asset_hash in missing_hashes:
+                continue
+            known = self._KNOWN_ASSETS.get((asset_hash or "").lower())
+            if known:
+                symbol, decimals = known
+                asset_infos[asset_hash] = {"hash": asset_hash, "symbol": symbol, "decimals": decimals}
+                continue
+            cached_info = self._get_cached_asset_info(asset_hash)
+            if cached_info is not None:
+                asset_infos[asset_hash] = cached_info
+            else:
+                missing_hashes.append(asset_hash)
+        return asset_infos, missing_hashes
+    
+    def _merge_asset_info_results(self, asset_infos: Dict[str, Any], asset_hashes: List[str], info_results: List[Dict[str, Any]]):
+        """Cache fetched asset infos and add them to asset_infos."""
+        for asset_hash, info_result in zip(asset_hashes, info_results):
+            asset_info = info_result["result"] if "result" in info_result else info_result
+            self._cache_asset_info(asset_hash, asset_info)
+            asset_infos[asset_hash] = asset_info
+    
+    def _format_assets(self, assets: List[Dict[str, Any]], asset_infos: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Format raw asset balances using their resolved asset infos."""
+        processed_assets = []
+        
+        for asset in assets:
+            asset_hash = asset.get("asset")
+            balance_raw = asset.get("balance", "0")
+            
+            asset_info = asset_infos.get(asset_hash)
+            if isinstance(asset_info, dict) and "symbol" in asset_info:
+                decimals = int(asset_info.get("decimals", 0))
+                symbol = asset_info.get("symbol", "UNKNOWN")
+                balance_formatted = self.convert_asset_amount_string(balance_raw, decimals)
+                
+                processed_assets.append({
+                    "symbol": symbol,
+                    "balance": balance_formatted,
+                    "raw_balance": balance_raw,
+                    "contract_hash": asset_hash,
+                    "decimals": decimals
+                })
+        
+        return processed_assets
+    
+    def get_neo_gas_balance(self, address: str) -> Dict[str, str]:
+        """Get NEO and GAS balances with a single RPC, skipping asset info lookups."""
+        script_hash = self.convert_address_to_script_hash(address)
+        result = self._make_request("GetAssetsHeldByAddress", {"Address": script_hash})
+        
+        balances = {"NEO": "0", "GAS": "0"}
+        if "result" in result and "result" in result["result"]:
+            for asset in result["result"]["result"]:
+                known = self._KNOWN_ASSETS.get((asset.get("asset") or "").lower())
+                if known:
+                    symbol, decimals = known
+                    balances[symbol] = self.convert_asset_amount_string(asset.get("balance", "0"), decimals)
+        
+        return balances
+    
     def get_asset_info_by_hash(self, asset_hash: str) -> Dict[str, Any]:
         """Get asset information by contract hash."""
+        cached_info = self._get_cached_asset_info(asset_hash)
+        if cached_info is not None:
+            return cached_info
+        
         result = self._make_request("GetAssetInfoByContractHash", {"ContractHash": asset_hash})
         
         if "result" in result:
+            self._cache_asset_info(asset_hash, result["result"])
             return result["result"]
         return result
     
@@ -139,6 +483,15 @@ class NeoAPIClient:
             return result["result"]["index"]
         return 0
     
+    # 0 is the failure fallback, never a real height
+    @_async_ttl_cache(ttl=0.5, cacheable=lambda height: height > 0)
+    async def aget_block_count(self) -> int:
+        """Get current block height (async)."""
+        result = await self._arequest("GetBlockCount")
+        if "result" in result:
+            return result["result"]["index"]
+        return 0
+    
     def get_best_block_hash(self) -> str:
         """Get the latest block hash."""
         result = self._make_request("GetBestBlockHash")
@@ -161,6 +514,10 @@ class NeoAPIClient:
         result = self._make_request("GetBlockInfoList", {"Limit": limit})
         return result
     
+    async def aget_recent_blocks(self, limit: int = 10) -> Dict[str, Any]:
+        """Get recent block information (async)."""
+        return await self._arequest("GetBlockInfoList", {"Limit": limit})
+    
     # === Transaction Information ===
     def get_application_log(self, tx_hash: str) -> Dict[str, Any]:
         """Get application log by transaction hash."""
@@ -188,6 +545,11 @@ class NeoAPIClient:
         result = self._make_request("GetNep17TransferByAddress", {"Address": script_hash})
         return result
     
+    async def aget_nep17_transfers(self, address: str) -> Dict[str, Any]:
+        """Get NEP-17 token transfer history for address (async)."""
+        script_hash = self.convert_address_to_script_hash(address)
+        return await self._arequest("GetNep17TransferByAddress", {"Address": script_hash})
+    
     def get_nep17_transfers_by_block(self, block_height: int) -> Dict[str, Any]:
         """Get NEP-17 transfers in a specific block."""
         result = self._make_request("GetNep17TransferByBlockHeight", {"BlockHeight": block_height})
@@ -200,12 +562,22 @@ class NeoAPIClient:
         result = self._make_request("GetNep11OwnedByAddress", {"Address": script_hash})
         return result
     
+    async def aget_nep11_owned(self, address: str) -> Dict[str, Any]:
+        """Get NFTs owned by address (async)."""
+        script_hash = self.convert_address_to_script_hash(address)
+        return await self._arequest("GetNep11OwnedByAddress", {"Address": script_hash})
+    
     def get_nep11_transfers(self, address: str) -> Dict[str, Any]:
         """Get NFT transfer history for address."""
         script_hash = self.convert_address_to_script_hash(address)
         result = self._make_request("GetNep11TransferByAddress", {"Address": script_hash})
         return result
     
+    async def aget_nep11_transfers(self, address: str) -> Dict[str, Any]:
+        """Get NFT transfer history for address (async)."""
+        script_hash = self.convert_address_to_script_hash(address)
+        return await self._arequest("GetNep11TransferByAddress", {"Address": script_hash})
+    
     def get_nep11_balance(self, contract_hash: str, address: str, token_id: str) -> Dict[str, Any]:
         """Get specific NFT balance."""
         script_hash = self.convert_address_to_script_hash(address)
@@ -219,7 +591,17 @@ class NeoAPIClient:
     # === Contract Information ===
     def get_contract_by_hash(self, contract_hash: str) -> Dict[str, Any]:
         """Get contract information by hash."""
+        cached = self._contract_cache.get(contract_hash)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
         result = self._make_request("GetContractByContractHash", {"ContractHash": contract_hash})
+        
+        if "result" in result:
+            if len(self._contract_cache) >= self.CONTRACT_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                self._contract_cache.pop(next(iter(self._contract_cache)))
+            self._contract_cache[contract_hash] = (time.monotonic() + self.CONTRACT_INFO_TTL, result)
         return result
     
     def get_contracts_by_name(self, name: str) -> Dict[str, Any]:
@@ -259,6 +641,14 @@ class NeoAPIClient:
             return result["result"]["total counts"]
         return 0
     
+    # Failed lookups fall back to an error reply or a zero count; don't cache those
+    @_async_ttl_cache(ttl=5.0, cacheable=lambda info: "result" in info[0] and info[1] > 0)
+    async def aget_governance_info(self) -> Tuple[Dict[str, Any], int]:
+        """Get committee members and total candidate count in one batched round trip."""
+        committee, candidates = await self.abatch_call([("GetCommittee", {}), ("GetCandidateCount", {})])
+        candidate_count = candidates["result"]["total counts"] if "result" in candidates else 0
+        return committee, candidate_count
+    
     # === Statistics ===
     def get_active_addresses(self, days: int = 7) -> List[int]:
         """Get active address counts for past days."""
@@ -280,16 +670,37 @@ class NeoAPIClient:
         if "result" in result:
             return result["result"]["total counts"]
         return 0
+    
+    async def aget_asset_count(self) -> int:
+        """Get total asset count (async)."""
+        result = await self._arequest("GetAssetCount")
+        if "result" in result:
+            return result["result"]["total counts"]
+        return 0
 
 class AdvancedNeoWalletManager:
     """Advanced Neo wallet management with full blockchain integration."""
     
-    def __init__(self, network: str = "testnet"):
+    # Seconds a prefetched transaction history is served before a background refresh
+    HISTORY_TTL = 10.0
+    
+    # Private key formats keyed by (length, prefix): WIF, 0x-prefixed hex, raw hex
+    _KEY_LOADERS = {
+        (52, "K"): ("WIF", lambda key: Account.from_wif(key, "")),
+        (52, "L"): ("WIF", lambda key: Account.from_wif(key, "")),
+        (66, "0x"): ("hex", lambda key: Account.from_private_key(bytes.fromhex(key[2:]))),
+        (64, None): ("raw hex", lambda key: Account.from_private_key(bytes.fromhex(key)))
+    }
+    
+    def __init__(self, network: str = "testnet", session: Optional[aiohttp.ClientSession] = None):
         self.private_key = None
         self.wallet_address = None
         self.account = None
         self.is_loaded = False
-        self.api_client = NeoAPIClient(network)
+        self._cached_address: Optional[str] = None
+        self._history_task: Optional[asyncio.Task] = None
+        self._history_started_at = 0.0
+        self.api_client = NeoAPIClient(network, session=session)
         
     def load_from_env(self) -> bool:
         """Load wallet from environment variables."""
@@ -300,39 +711,33 @@ class AdvancedNeoWalletManager:
     
     def load_private_key(self, private_key: str) -> bool:
         """Load private key and derive wallet address using neo-mamba."""
+        self.private_key = private_key.strip()
+        # A (re)load invalidates the previously derived address
+        self.is_loaded = False
+        self._cached_address = None
+        self._reset_history()
+        
+        if not NEO3_AVAILABLE:
+            logger.warning("Neo3 libraries not available, limited functionality")
+            return False
+        
+        # Pick the loader by (length, prefix); raw hex has no fixed prefix
+        key_length = len(self.private_key)
+        prefix = "0x" if self.private_key.startswith("0x") else self.private_key[:1]
+        key_format = self._KEY_LOADERS.get((key_length, prefix)) or self._KEY_LOADERS.get((key_length, None))
+        if key_format is None:
+            logger.error("❌ Invalid private key format")
+            return False
+        
+        format_name, loader = key_format
         try:
-            self.private_key = private_key.strip()
-            
-            if not NEO3_AVAILABLE:
-                logger.warning("Neo3 libraries not available, limited functionality")
-                return False
-            
-            # Handle different private key formats
-            if self.private_key.startswith('K') or self.private_key.startswith('L'):
-                # WIF format
-                self.account = Account.from_wif(self.private_key, "")
-                self.wallet_address = self.account.address
-                logger.info(f"✅ Derived address from WIF: {self.wallet_address}")
-                
-            elif len(self.private_key) == 66 and self.private_key.startswith('0x'):
-                # Hex with 0x prefix
-                private_key_bytes = bytes.fromhex(self.private_key[2:])
-                self.account = Account.from_private_key(private_key_bytes)
-                self.wallet_address = self.account.address
-                logger.info(f"✅ Derived address from hex: {self.wallet_address}")
-                
-            elif len(self.private_key) == 64:
-                # Raw hex format
-                private_key_bytes = bytes.fromhex(self.private_key)
-                self.account = Account.from_private_key(private_key_bytes)
-                self.wallet_address = self.account.address
-                logger.info(f"✅ Derived address from raw hex: {self.wallet_address}")
-                
-            else:
-                logger.error("❌ Invalid private key format")
-                return False
+            self.account = loader(self.private_key)
+            self.wallet_address = self.account.address
+            logger.info(f"✅ Derived address from {format_name}: {self.wallet_address}")
             
+            self._cached_address = self.wallet_address
             self.is_loaded = True
+            self._prefetch_history()
             return True
             
         except Exception as e:
@@ -341,7 +746,7 @@ class AdvancedNeoWalletManager:
     
     def get_address(self) -> Optional[str]:
         """Get the wallet address."""
-        return self.wallet_address if self.is_loaded else None
+        return self._cached_address
     
     def get_balance(self) -> Dict[str, str]:
         """Get wallet balance for NEO and GAS."""
@@ -349,30 +754,70 @@ class AdvancedNeoWalletManager:
             return {"NEO": "0", "GAS": "0"}
         
         try:
-            assets_result = self.api_client.get_assets_by_address(self.wallet_address)
-            if "assets" in assets_result:
-                balances = {"NEO": "0", "GAS": "0"}
-                for asset in assets_result["assets"]:
-                    symbol = asset["symbol"]
-                    if symbol in ["NEO", "GAS"]:
-                        balances[symbol] = asset["balance"]
-                return balances
+            return self.api_client.get_neo_gas_balance(self.wallet_address)
         except Exception as e:
             logger.error(f"Failed to get balance: {e}")
         
         return {"NEO": "0", "GAS": "0"}
     
-    def get_transaction_history(self) -> Dict[str, Any]:
-        """Get transaction history for the wallet."""
+    async def aclose(self):
+        """Cancel any history prefetch and close the API client's pooled connections."""
+        task = self._history_task
+        self._reset_history()
+        if task is not None:
+            # Let the cancelled fetch unwind before its HTTP session is closed
+            await asyncio.gather(task, return_exceptions=True)
+        self.api_client.close()
+        await self.api_client.aclose()
+    
+    def _reset_history(self):
+        """Drop the prefetched history, cancelling a fetch still in flight."""
+        if self._history_task is not None and not self._history_task.done():
+            self._history_task.cancel()
+        self._history_task = None
+    
+    def _start_history_fetch(self) -> asyncio.Task:
+        """Start fetching the wallet's transfer history in the background."""
+        self._history_started_at = time.monotonic()
+        self._history_task = asyncio.create_task(self._fetch_history(self.wallet_address))
+        return self._history_task
+    
+    def _prefetch_history(self):
+        """Warm the history cache right after load when an event loop is running."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop yet; the first get_transaction_history call fetches
+        self._start_history_fetch()
+    
+    async def get_transaction_history(self) -> Dict[str, Any]:
+        """Get transaction history for the wallet, serving stale results while refreshing."""
         if not self.is_loaded:
             return {}
         
+        task = self._history_task
+        if task is None or task.cancelled():
+            return await self._start_history_fetch()
+        if not task.done():
+            # Shield the shared fetch so one cancelled caller doesn't cancel it for all
+            return await asyncio.shield(task)
+        
+        history = task.result()
+        if not history:
+            # The last fetch failed; retry rather than serving the empty result
+            return await self._start_history_fetch()
+        if time.monotonic() - self._history_started_at >= self.HISTORY_TTL:
+            self._start_history_fetch()
+        return history
+    
+    async def _fetch_history(self, address: str) -> Dict[str, Any]:
+        """Fetch NEP-17 and NEP-11 transfer history for an address."""
         try:
-            # Get NEP-17 transfers
-            nep17_transfers = self.api_client.get_nep17_transfers(self.wallet_address)
-            
-            # Get NEP-11 transfers
-            nep11_transfers = self.api_client.get_nep11_transfers(self.wallet_address)
+            # Get NEP-17 and NEP-11 transfers concurrently
+            nep17_transfers, nep11_transfers = await asyncio.gather(
+                self.api_client.aget_nep17_transfers(address),
+                self.api_client.aget_nep11_transfers(address)
+            )
             
             return {
                 "nep17_transfers": nep17_transfers,
@@ -382,6 +827,36 @@ class AdvancedNeoWalletManager:
             logger.error(f"Failed to get transaction history: {e}")
             return {}
     
+    async def snapshot(self) -> Dict[str, Any]:
+        """Get balances, transfer history and NFTs for the wallet with concurrent RPCs."""
+        if not self.is_loaded:
+            return {}
+        
+        try:
+            assets, nep17_transfers, nep11_transfers, nft_collection = await asyncio.gather(
+                self.api_client.aget_assets_by_address(self.wallet_address),
+                self.api_client.aget_nep17_transfers(self.wallet_address),
+                self.api_client.aget_nep11_transfers(self.wallet_address),
+                self.api_client.aget_nep11_owned(self.wallet_address)
+            )
+            
+            balances = {"NEO": "0", "GAS": "0"}
+            for asset in assets.get("assets", []):
+                if asset["symbol"] in balances:
+                    balances[asset["symbol"]] = asset["balance"]
+            
+            return {
+                "address": self.wallet_address,
+                "balances": balances,
+                "assets": assets.get("assets", []),
+                "nep17_transfers": nep17_transfers,
+                "nep11_transfers": nep11_transfers,
+                "nft_collection": nft_collection
+            }
+        except Exception as e:
+            logger.error(f"Failed to get wallet snapshot: {e}")
+            return {}
+    
     def get_nft_collection(self) -> Dict[str, Any]:
         """Get NFT collection owned by the wallet."""
         if not self.is_loaded:
@@ -399,6 +874,30 @@ class ComprehensiveSecurityChecker:
     def __init__(self):
         self.goplus_api_key = os.getenv("GOPLUS_API_KEY") or os.getenv("GO_PLUS_LABS_APP_KEY")
         self.base_url = "https://api.gopluslabs.io"
+        self._session = None
+    
+    async def __aenter__(self):
+        self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the GoPlusLabs HTTP session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the persistent GoPlusLabs session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers={"Authorization": f"Bearer {self.goplus_api_key}"}
+            )
+        return self._session
     
     async def check_address_security(self, address: str) -> Dict[str, Any]:
         """Comprehensive address security check."""
@@ -412,6 +911,9 @@ class ComprehensiveSecurityChecker:
         # Format validation
         results["checks"]["format"] = self._check_address_format(address)
         
+        # Neo network validation is local and synchronous, so run it before the only await
+        neo_network = self._check_neo_network_validity(address)
+        
         # GoPlusLabs API check
         if self.goplus_api_key:
             results["checks"]["goplus"] = await self._check_goplus_security(address)
@@ -421,8 +923,7 @@ class ComprehensiveSecurityChecker:
                 "reason": "API key not configured"
             }
         
-        # Neo network validation
-        results["checks"]["neo_network"] = self._check_neo_network_validity(address)
+        results["checks"]["neo_network"] = neo_network
         
         # Determine overall safety
         overall_safe = all(
@@ -435,9 +936,19 @@ class ComprehensiveSecurityChecker:
         
         return results
     
+    async def check_many(self, addresses: List[str], max_concurrency: int = 10) -> List[Dict[str, Any]]:
+        """Check several addresses concurrently, bounded to respect GoPlusLabs rate limits."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def check_one(address: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.check_address_security(address)
+        
+        return await asyncio.gather(*(check_one(address) for address in addresses))
+    
     def _check_address_format(self, address: str) -> Dict[str, Any]:
         """Check Neo address format."""
-        if not address or len(address) != 34 or not address.startswith('N'):
+        if not address or not _NEO_ADDR_RE.fullmatch(address):
             return {
                 "is_safe": False,
                 "status": "invalid_format",
@@ -446,7 +957,7 @@ class ComprehensiveSecurityChecker:
         
         if NEO3_AVAILABLE:
             try:
-                is_valid = neo3.wallet.utils.is_valid_address(address)
+                is_valid = _is_valid_neo_address(address)
                 return {
                     "is_safe": is_valid,
                     "status": "valid" if is_valid else "invalid",
@@ -465,30 +976,25 @@ class ComprehensiveSecurityChecker:
         """Check address against GoPlusLabs database."""
         try:
             url = f"{self.base_url}/api/v1/address_security/{address}"
-            headers = {"Authorization": f"Bearer {self.goplus_api_key}"}
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        result = data.get("result", {})
-                        
-                        malicious_flags = [
-                            "blacklist_doubt", "blackmail_activities", "cybercrime",
-                            "darkweb_transactions", "financial_crime", "fake_token",
-                            "honeypot_related_address", "malicious_mining_activities",
-                            "mixer", "money_laundering", "phishing_activities", "stealing_attack"
-                        ]
-                        
-                        detected_flags = [flag for flag in malicious_flags if result.get(flag) == "1"]
-                        is_malicious = len(detected_flags) > 0
-                        
-                        return {
-                            "is_safe": not is_malicious,
-                            "status": "flagged" if is_malicious else "clean",
-                            "detected_flags": detected_flags,
-                            "message": f"GoPlusLabs check: {'Flagged' if is_malicious else 'Clean'}"
-                        }
+            async with self._get_session().get(url) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    result = data.get("result", {})
+                    
+                    # Stop at the first hit; only collect every flag for flagged addresses
+                    is_malicious = any(result.get(flag) == "1" for flag in _MALICIOUS_FLAGS)
+                    detected_flags = (
+                        [flag for flag in _MALICIOUS_FLAGS if result.get(flag) == "1"]
+                        if is_malicious else []
+                    )
+                    
+                    return {
+                        "is_safe": not is_malicious,
+                        "status": "flagged" if is_malicious else "clean",
+                        "detected_flags": detected_flags,
+                        "message": f"GoPlusLabs check: {'Flagged' if is_malicious else 'Clean'}"
+                    }
             
             return {
                 "is_safe": True,
@@ -522,20 +1028,20 @@ class ComprehensiveSecurityChecker:
     
     def _calculate_risk_level(self, checks: Dict[str, Any]) -> str:
         """Calculate overall risk level based on checks."""
-        unsafe_checks = sum(1 for check in checks.values() 
-                          if isinstance(check, dict) and not check.get("is_safe", True))
+        unsafe_checks = 0
+        for check in checks.values():
+            if isinstance(check, dict) and not check.get("is_safe", True):
+                unsafe_checks += 1
+                if unsafe_checks > 1:
+                    return "high"
         
-        if unsafe_checks == 0:
-            return "low"
-        elif unsafe_checks <= 1:
-            return "medium"
-        else:
-            return "high"
+        return "medium" if unsafe_checks else "low"
 
 # Export classes for use in main agent
 __all__ = [
     'NeoAPIClient',
     'AdvancedNeoWalletManager', 
     'ComprehensiveSecurityChecker',
+    'format_timestamp',
     'NEO3_AVAILABLE'
 ]
@@ -9,17 +9,39 @@ import sys
 import asyncio
 import logging
 import json
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
-from datetime import datetime
+import time
+import threading
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
 from dotenv import load_dotenv
+import aiohttp
 import re
+import functools
+from collections import Counter
+
+# uvloop is optional and has no Windows support
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = sys.platform != "win32"
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
 # Load environment variables
 load_dotenv(override=True)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Configure logging (unknown LOG_LEVEL values fall back to INFO)
+_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL
+}
+logging.basicConfig(
+    level=_LOG_LEVELS.get(os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
 logger = logging.getLogger(__name__)
 
 # Import our comprehensive tools
@@ -40,18 +62,525 @@ from security_and_analysis_tools import (
     PriceAlert
 )
 
-@dataclass
+# REPL commands that end the session
+_EXIT_COMMANDS = frozenset({'quit', 'exit', 'bye'})
+_EXIT_COMMAND_MAX_LEN = max(map(len, _EXIT_COMMANDS))
+
+# Messages that show the command reference
+_HELP_SET = frozenset({'help', '?', 'commands', 'what can you do'})
+
+# REPL prompt and per-turn status line
+_PROMPT = "\n💬 You: "
+_PROCESSING_MSG = "🤔 Processing your request..."
+_RESPONSE_HEADER = "\n🤖 NeoXBridge AI "
+_STATUS_EMOJI = ("❌", "✅")  # indexed by response.success
+
+# Demo balance for addresses missing from the demo table
+_NO_DEMO_BALANCE = MappingProxyType({"NEO": 0.0, "GAS": 0.0})
+
+# Entity extraction patterns used by parse_intent and the handlers
+_HEX0X_KEY_RE = re.compile(r'0x[a-fA-F0-9]{64}')
+_PRIVATE_KEY_RES = (
+    re.compile(r'[KL][1-9A-HJ-NP-Za-km-z]{51}'),  # WIF format
+    _HEX0X_KEY_RE,  # Hex with 0x
+    re.compile(r'\b[a-fA-F0-9]{64}\b')  # Raw hex
+)
+_ADDRESS_RE = re.compile(r'([Nn][A-Za-z0-9]{33})')
+_ENTITY_RE = re.compile(r'(?P<address>[Nn][A-Za-z0-9]{33})|(?P<token>0x[a-fA-F0-9]{40})|(?P<url>https?://[^\s]+)')
+_SEND_RE = re.compile(r'(?:send|transfer|pay)\s+(\d+(?:\.\d+)?)\s+(neo|gas)\s+to\s+([Nn][A-Za-z0-9]{33})', re.IGNORECASE)
+_PRICE_ALERT_RE = re.compile(r'(neo|gas|bitcoin|ethereum)\s+(above|below)\s+([\d.]+)', re.IGNORECASE)
+
+def _search_address(message: str) -> "Optional[re.Match[str]]":
+    """Find a Neo address, skipping the regex when no address can start in message."""
+    if 'N' not in message and 'n' not in message:
+        return None
+    return _ADDRESS_RE.search(message)
+
+def _keyword_re(*keywords: str) -> "re.Pattern[str]":
+    """Compile keywords into one case-insensitive alternation matched in a single scan."""
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+# Intent keyword categories, checked by parse_intent in priority order
+_WALLET_RE = _keyword_re('load wallet', 'import wallet', 'wallet status', 'my address', 'private key')
+_BALANCE_RE = _keyword_re('balance')
+_SECURITY_RE = _keyword_re('security', 'safe', 'malicious', 'check address', 'analyze')
+_BLOCKCHAIN_RE = _keyword_re('block', 'transaction', 'tx', 'contract', 'asset info')
+_NFT_RE = _keyword_re('nft', 'nep11', 'collectible', 'non-fungible')
+_PRICE_RE = _keyword_re('price', 'alert', 'monitor')
+_SEND_KEYWORD_RE = _keyword_re('send', 'transfer', 'pay')
+_TX_ANALYSIS_RE = _keyword_re('transaction history', 'tx history', 'recent transactions')
+_GOVERNANCE_RE = _keyword_re('governance', 'committee', 'candidate', 'vote', 'voting')
+_BULK_RE = _keyword_re('bulk', 'multiple', ',')
+_FORCE_RE = _keyword_re('force', 'refresh')
+
+# Handler sub-command keywords; _BLOCK_HEIGHT_RE.match requires both words
+_BLOCK_HEIGHT_RE = re.compile(r'(?=.*block).*height', re.IGNORECASE | re.DOTALL)
+_RECENT_BLOCKS_RE = _keyword_re('recent blocks')
+_ASSET_COUNT_RE = _keyword_re('asset count')
+_CREATE_ALERT_RE = _keyword_re('create alert', 'price alert')
+_LIST_ALERTS_RE = _keyword_re('check alerts', 'my alerts')
+
+def _match_intent(message: str) -> Dict[str, Any]:
+    """Parse user intent from message with comprehensive pattern matching."""
+    # Wallet operations
+    if _WALLET_RE.search(message):
+        # Extract private key if present
+        private_key = None
+        has_0x = '0x' in message
+        for pattern in _PRIVATE_KEY_RES:
+            if pattern is _HEX0X_KEY_RE and not has_0x:
+                continue
+            match = pattern.search(message)
+            if match:
+                private_key = match.group()
+                break
+                
+        return {"type": "wallet_operations", "action": "load", "private_key": private_key}
+    
+    # Balance operations
+    if _BALANCE_RE.search(message):
+        address_match = _search_address(message)
+        return {
+            "type": "balance_check", 
+            "address": address_match.group(1) if address_match else None
+        }
+    
+    # Security analysis
+    if _SECURITY_RE.search(message):
+        # One scan for the first address, token or URL; the group name is the target type
+        entity_match = _ENTITY_RE.search(message)
+        if entity_match:
+            target, target_type = entity_match.group(entity_match.lastgroup), entity_match.lastgroup
+        else:
+            target, target_type = None, "address"
+            
+        return {
+            "type": "security_analysis",
+            "target": target,
+            "target_type": target_type,
+            "force": bool(_FORCE_RE.search(message))
+        }
+    
+    # Blockchain data
+    if _BLOCKCHAIN_RE.search(message):
+        return {"type": "blockchain_data", "query": message}
+    
+    # NFT operations
+    if _NFT_RE.search(message):
+        address_match = _search_address(message)
+        return {"type": "nft_operations", "address": address_match.group(1) if address_match else None}
+    
+    # Price monitoring
+    if _PRICE_RE.search(message):
+        return {"type": "price_monitoring", "query": message}
+    
+    # Transaction operations (send/transfer)
+    if _SEND_KEYWORD_RE.search(message):
+        # Check for bulk/multiple recipient patterns
+        if _BULK_RE.search(message):
+            return {"type": "bulk_transaction", "query": message}
+        else:
+            # Single recipient transaction
+            # Parse: "send 5 NEO to NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N"
+            match = _SEND_RE.search(message)
+            if match:
+                return {
+                    "type": "send_transaction",
+                    "amount": float(match.group(1)),
+                    "asset": match.group(2).upper(),
+                    "recipient": match.group(3)
+                }
+            else:
+                return {"type": "transaction_help", "query": message}
+    
+    # Transaction analysis/history
+    if _TX_ANALYSIS_RE.search(message):
+        return {"type": "transaction_analysis", "query": message}
+    
+    # Governance
+    if _GOVERNANCE_RE.search(message):
+        return {"type": "governance_info", "query": message}
+    
+    # Help
+    if message.lower() in _HELP_SET:
+        return {"type": "help"}
+    
+    return {"type": "general", "message": message}
+
+@functools.lru_cache(maxsize=256)
+def _parse_intent_impl(message: str) -> Tuple[Tuple[str, Any], ...]:
+    """Memoized intent parse, frozen to a tuple of items so cached results can't be mutated."""
+    return tuple(_match_intent(message).items())
+
+# Security verdict -> (emoji, status text) for analysis headers
+_SAFE_STYLE = ("✅", "SAFE")
+_RISK_STYLE = {
+    "low": ("🚨", "RISK: LOW"),
+    "medium": ("⚠️", "RISK: MEDIUM"),
+    "high": ("⚠️", "RISK: HIGH"),
+    "critical": ("🚨", "RISK: CRITICAL"),
+    "unknown": ("🚨", "RISK: UNKNOWN")
+}
+
+# Response message templates, filled in with str.format by the handlers
+_WALLET_LOADED_TPL = """✅ **Wallet Loaded Successfully!**
+
+📍 **Address:** `{address}`
+💼 **Network:** {network}
+🔐 **Status:** Ready for operations
+
+Available operations:
+• `check my balance` - View NEO/GAS balance
+• `my nfts` - View NFT collection  
+• `transaction history` - View recent transactions
+• `security check {address}` - Analyze address security"""
+
+_WALLET_STATUS_TPL = """💼 **Wallet Status**
+
+🔸 **Address:** `{address}`
+🔸 **Network:** {network}
+🔸 **Status:** ✅ Loaded and ready
+🔸 **Neo3 Support:** {neo3_status}"""
+
+_BALANCE_TPL = """💰 **Balance for {address}**
+
+🔸 **NEO:** {neo}
+🔸 **GAS:** {gas}
+
+{source_emoji} **Source:** {data_source}_data
+📊 **Network:** {network}"""
+
+_SECURITY_ANALYSIS_TPL = """🛡️ **Security Analysis - {status_text}**
+
+{risk_emoji} **Target:** `{target}`
+🔸 **Type:** {target_type}
+🔸 **Risk Level:** {risk_level}
+🔸 **Confidence:** {confidence:.1%}
+🔸 **Checks Passed:** {checks_passed}/{total_checks}
+
+📊 **Analysis Details:**
+{details}
+
+🕒 **Analyzed:** {analyzed_at:%Y-%m-%d %H:%M:%S}"""
+
+_BLOCK_HEIGHT_TPL = """📊 **Neo Blockchain Data**
+
+🔸 **Current Block Height:** {height:,}
+🔸 **Network:** {network}
+📡 **Node:** {node_url}"""
+
+# List responses are joined from a header, one "• ...\n" line per item and a footer
+_RECENT_BLOCKS_HEADER = "📊 **Recent Blocks**\n\n"
+_RECENT_BLOCKS_FOOTER_TPL = "\n🔸 **Network:** {network}"
+
+_ASSET_COUNT_TPL = """📊 **Neo Asset Statistics**
+
+🔸 **Total Assets:** {count:,}
+🔸 **Network:** {network}
+💼 **Includes:** NEP-17 tokens, NEP-11 NFTs"""
+
+_BLOCKCHAIN_OVERVIEW_TPL = """📊 **Neo Blockchain Overview**
+
+🔸 **Current Height:** {height:,}
+🔸 **Total Assets:** {asset_count:,}
+🔸 **Network:** {network}
+📡 **Status:** Online
+
+**Available queries:**
+• `recent blocks` - Show recent block info
+• `asset count` - Total number of assets
+• `block height` - Current blockchain height"""
+
+_NFT_COLLECTION_HEADER_TPL = """🎨 **NFT Collection for {address}**
+
+🔸 **Total NFTs:** {nft_count}
+📦 **Collections:**
+
+"""
+_NFT_COLLECTION_FOOTER_TPL = "\n🌐 **Network:** {network}"
+
+_NFT_EMPTY_TPL = """🎨 **NFT Collection for {address}**
+
+🔸 **Total NFTs:** 0
+📦 **Collections:** None found
+
+🌐 **Network:** {network}"""
+
+_PRICE_ALERT_CREATED_TPL = """🚨 **Price Alert Created**
+
+🔸 **Symbol:** {symbol}
+🔸 **Condition:** {condition} ${target_price}
+🔸 **Status:** Active
+🔸 **Created:** {created_at:%Y-%m-%d %H:%M:%S}
+
+I'll monitor the price and notify you when triggered!"""
+
+_ACTIVE_ALERTS_TPL = """🚨 **Active Price Alerts**
+
+{alerts}
+
+🔸 **Total Active:** {total}"""
+
+_INSUFFICIENT_BALANCE_TPL = """💸 **Insufficient Balance**
+
+❌ **Transaction cannot proceed**
+
+🔸 **Required:** {required_amount} {asset} ({amount} + {fee} fee)
+🔸 **Available:** {current_balance} {asset}
+🔸 **Shortage:** {shortage} {asset}
+
+Please ensure you have sufficient balance and try again."""
+
+_TRANSACTION_PREVIEW_TPL = """💸 **Transaction Preview**
+
+📤 **From:** `{sender_address}`
+📥 **To:** `{recipient}`
+💰 **Amount:** {amount} {asset}
+⛽ **Network Fee:** {network_fee} GAS
+🔸 **Total Cost:** {amount} {asset}{extra_fee}
+
+🛡️ **Security Status:** {security_status}
+
+**This is a PREVIEW. To execute the transaction, confirm by typing:**
+`confirm send {amount} {asset} to {recipient}`"""
+
+_TRANSACTION_ANALYSIS_TPL = """📊 **Transaction Analysis for {address}**
+
+🔸 **NEP-17 Transfers:** Available
+🔸 **NEP-11 Transfers:** Available
+🔸 **Network:** {network}
+
+**Recent activity analysis would show:**
+• Transaction volume patterns
+• Most frequent interactions
+• Token transfer history
+• NFT activity
+
+*Full analysis requires blockchain API integration*"""
+
+_GOVERNANCE_TPL = """🏛️ **Neo Governance Information**
+
+🔸 **Committee Members:** {committee_size}
+🔸 **Total Candidates:** {candidate_count}
+🔸 **Network:** {network}
+
+**Governance Features:**
+• Committee member voting
+• Candidate registration
+• Voting power delegation
+• Network parameter changes
+
+Use `candidate info ADDRESS` for specific candidate details."""
+
+# Repeat queries render identical text, so memoize per unique argument tuple
+@functools.lru_cache(maxsize=64)
+def _render_tx_analysis(address: str, network: str) -> str:
+    """Render the transaction analysis message for an address."""
+    return _TRANSACTION_ANALYSIS_TPL.format(address=address, network=network)
+
+@functools.lru_cache(maxsize=64)
+def _render_governance(committee_size: int, candidate_count: int, network: str) -> str:
+    """Render the governance summary message."""
+    return _GOVERNANCE_TPL.format(
+        committee_size=committee_size,
+        candidate_count=candidate_count,
+        network=network
+    )
+
+# Static help and feature messages
+_BULK_TX_WALLET_ERROR_MSG = """💸 **Bulk Transaction Error**
+
+❌ **Wallet not loaded**
+
+To send bulk transactions, load your wallet first:
+`load wallet YOUR_PRIVATE_KEY`"""
+
+_BULK_TX_PREVIEW_MSG = """💸 **Bulk Transaction Feature**
+
+🚀 **Coming Soon!** Bulk transactions will allow you to:
+
+• Send to multiple recipients in one transaction
+• Batch payments with reduced fees
+• Mass airdrops and distributions
+• Multi-recipient smart contract calls
+
+**Example Usage (Future):**
+```
+bulk send NEO:
+  NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N: 5
+  NhGomKyZgSuYUGqrXHcpv1bNH9ntwvfm4c: 3
+  NUVPACMnKFhpuHjsRjhUvXz1XhqfGZYVtY: 2
+```
+
+For now, use individual transactions:
+`send 5 NEO to ADDRESS`"""
+
+_TX_HELP_MSG = """💸 **Transaction Commands Help**
+
+🚀 **Send Tokens:**
+• `send AMOUNT ASSET to ADDRESS` - Send NEO/GAS
+• `transfer 5 NEO to NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N`
+• `pay 10.5 GAS to NhGomKyZgSuYUGqrXHcpv1bNH9ntwvfm4c`
+
+🔐 **Requirements:**
+• Wallet must be loaded first
+• Sufficient balance (including network fees)
+• Valid recipient address
+
+🛡️ **Security Features:**
+• Automatic recipient address validation
+• Comprehensive security checks via GoPlusLabs
+• Balance verification before sending
+• Transaction preview and confirmation
+
+💡 **Supported Assets:**
+• NEO (indivisible - whole numbers only)
+• GAS (divisible - decimal amounts allowed)
+
+**Examples:**
+```
+load wallet YOUR_PRIVATE_KEY
+check my balance
+send 5 NEO to NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N
+transfer 2.5 GAS to NhGomKyZgSuYUGqrXHcpv1bNH9ntwvfm4c
+```"""
+
+_HELP_MSG = """🤖 **NeoXBridge AI - Complete Command Reference**
+
+🔐 **Wallet Management:**
+• `load wallet PRIVATE_KEY` - Load your Neo wallet
+• `wallet status` - Check wallet status
+• `my address` - Show wallet address
+
+💰 **Balance & Assets:**
+• `check my balance` - Check your balance
+• `balance for ADDRESS` - Check any address
+• `my nfts` - View your NFT collection
+
+🛡️ **Security Analysis:**
+• `security check ADDRESS` - Analyze address safety
+• `analyze token CONTRACT` - Token security analysis
+• `security check URL` - Website safety check
+• `force security check ADDRESS` - Re-run checks, bypassing cached results
+
+📊 **Blockchain Data:**
+• `block height` - Current blockchain height
+• `recent blocks` - Recent block information
+• `asset count` - Total assets on network
+
+📈 **Price Monitoring:**
+• `create price alert SYMBOL above/below PRICE` - Create alert
+• `check my alerts` - View active alerts
+• `neo price` - Get current prices
+
+💸 **Token Transfers:**
+• `send AMOUNT ASSET to ADDRESS` - Send tokens securely
+• `transfer 5 NEO to ADDRESS` - Transfer NEO tokens  
+• `pay 10.5 GAS to ADDRESS` - Send GAS payments
+• `send help` - Transaction help and examples
+
+🏛️ **Governance:**
+• `committee info` - Neo committee information
+• `candidate count` - Total candidates
+
+💡 **System:**
+• `help` - Show this help
+• `quit` - Exit application
+
+**Example Usage:**
+```
+load wallet KxcgHRTc8SUcvwkG7V8HLoFrPHkUMskeV9nx5fvuTbsEU3z3kAS2
+check my balance
+security check NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N
+create price alert NEO above 50
+```"""
+
+_WELCOME_MSG = """🌉 **Welcome to NeoXBridge AI!**
+
+I'm your comprehensive Neo blockchain assistant with advanced capabilities:
+
+🔸 **Complete Neo N3 integration** - Real blockchain data
+🔸 **Advanced security analysis** - Multi-layer protection
+🔸 **Price monitoring & alerts** - Never miss market moves
+🔸 **NFT tracking & analysis** - Full collectible management
+🔸 **Governance insights** - Committee and voting data
+
+Type `help` for all commands, or try:
+• `load wallet YOUR_PRIVATE_KEY`
+• `security check ADDRESS`
+• `create price alert NEO above 50`
+
+What would you like to explore?"""
+
+# Canned error messages for the common failure classes
+_ERR_TIMEOUT_MSG = "❌ The request timed out. The network may be busy, please try again."
+_ERR_CONNECTION_MSG = "❌ Could not reach the network service. Please check your connection and try again."
+_ERR_GOVERNANCE_UNAVAILABLE_MSG = "❌ Could not retrieve governance information"
+_ERR_BLOCK_HEIGHT_UNAVAILABLE_MSG = "❌ Could not retrieve the current block height"
+
+def _create_http_session() -> aiohttp.ClientSession:
+    """Create the pooled keep-alive HTTP session shared by the agent's clients."""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, limit_per_host=30, ttl_dns_cache=300)
+    )
+
+async def _ainput(prompt: str) -> str:
+    """Read a line from stdin on a daemon thread so the event loop keeps running."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def settle(result: Optional[str], error: Optional[BaseException]) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    
+    def read() -> None:
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            loop.call_soon_threadsafe(settle, None, e)
+        else:
+            loop.call_soon_threadsafe(settle, line, None)
+    
+    # A daemon thread (unlike asyncio.to_thread) never blocks interpreter exit on a pending read
+    threading.Thread(target=read, name="stdin-reader", daemon=True).start()
+    return await future
+
+def _slotted_dataclass(cls: type) -> type:
+    """Apply @dataclass(slots=True), rebuilding the class with __slots__ on Python < 3.10."""
+    if sys.version_info >= (3, 10):
+        return dataclass(slots=True)(cls)
+    cls = dataclass(cls)
+    field_names = tuple(f.name for f in fields(cls))
+    # Slots can't coexist with class-level defaults; __init__ already carries them
+    namespace = {
+        key: value for key, value in cls.__dict__.items()
+        if key not in field_names and key not in ('__dict__', '__weakref__')
+    }
+    namespace['__slots__'] = field_names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+@_slotted_dataclass
 class AgentResponse:
     """Structured response from the agent."""
     success: bool
     message: str
     data: Any = None
     action_type: str = "general"
-    timestamp: datetime = None
+    timestamp: float = field(default_factory=time.time)  # epoch seconds
 
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+def _error_response(error: Exception, context: str, action_type: str) -> AgentResponse:
+    """Build a failed response, with canned text for timeouts and connection errors."""
+    if isinstance(error, asyncio.TimeoutError):
+        message = _ERR_TIMEOUT_MSG
+    elif isinstance(error, aiohttp.ClientError):
+        message = _ERR_CONNECTION_MSG
+    else:
+        message = f"❌ {context}: {error}"
+    return AgentResponse(success=False, message=message, action_type=action_type)
 
 class NeoXBridgeComprehensiveAgent:
     """
@@ -64,36 +593,81 @@ class NeoXBridgeComprehensiveAgent:
     - Transaction analysis
     """
     
-    def __init__(self, network: str = "testnet"):
+    def __init__(self, network: str = "testnet", session: Optional[aiohttp.ClientSession] = None):
         self.network = network
-        self.wallet_manager = AdvancedNeoWalletManager(network)
-        self.neo_api = NeoAPIClient(network)
-        self.security_suite = ComprehensiveSecuritySuite()
-        self.conversation_history = []
-        self.session_start = datetime.now()
+        
+        # A session passed in by the caller is shared by every async client and stays
+        # open when the agent is closed; without one, each client creates its own
+        # lazily on first use, so the agent can be built outside a running loop
+        self.wallet_manager = AdvancedNeoWalletManager(network, session=session)
+        self.neo_api = NeoAPIClient(network, session=session)
+        self.security_suite = ComprehensiveSecuritySuite(session=session)
+        # Conversation history as parallel lists; timestamps are epoch seconds
+        self.history_roles: List[str] = []
+        self.history_contents: List[str] = []
+        self.history_timestamps: List[float] = []
+        self.session_start = time.time()
         
         # Initialize additional tools
-        self.price_monitor = CryptoPriceMonitor()
+        self.price_monitor = CryptoPriceMonitor(session=session)
         self.wallet_analyzer = WalletAnalyzer()
         
-        # Demo balances for fallback
-        self.demo_balances = {
-            "NVByrj4w4W6mtXj7Lhqu9tqgZ7ApQb4UG3": {"NEO": "5.0", "GAS": "10.25"},
-            "NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N": {"NEO": "150.0", "GAS": "85.42"},
-            "NhGomKyZgSuYUGqrXHcpv1bNH9ntwvfm4c": {"NEO": "25.0", "GAS": "12.87"}
+        # Demo balances for fallback, pre-parsed to floats and read-only
+        self.demo_balances = MappingProxyType({
+            "NVByrj4w4W6mtXj7Lhqu9tqgZ7ApQb4UG3": MappingProxyType({"NEO": 5.0, "GAS": 10.25}),
+            "NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N": MappingProxyType({"NEO": 150.0, "GAS": 85.42}),
+            "NhGomKyZgSuYUGqrXHcpv1bNH9ntwvfm4c": MappingProxyType({"NEO": 25.0, "GAS": 12.87})
+        })
+        
+        # Intent type -> handler; async handlers return coroutines to await
+        self._handlers = {
+            "wallet_operations": self.handle_wallet_operations,
+            "balance_check": self.handle_balance_operations,
+            "security_analysis": self.handle_security_analysis,
+            "blockchain_data": self.handle_blockchain_data,
+            "nft_operations": self.handle_nft_operations,
+            "price_monitoring": self.handle_price_monitoring,
+            "send_transaction": self.handle_send_transaction,
+            "bulk_transaction": self.handle_bulk_transaction,
+            "transaction_help": lambda intent: self.get_transaction_help_response(),
+            "transaction_analysis": self.handle_transaction_analysis,
+            "governance_info": self.handle_governance_info,
+            "help": lambda intent: self.get_help_response()
         }
+        # Resolved once so dispatch never has to inspect the handler's result
+        self._async_handlers = frozenset(
+            action for action, handler in self._handlers.items()
+            if asyncio.iscoroutinefunction(handler)
+        )
         
         # Auto-load wallet if available
         if self.wallet_manager.load_from_env():
             print(f"🔓 Wallet auto-loaded: {self.wallet_manager.get_address()}")
     
+    async def close(self):
+        """Close HTTP sessions the agent's clients created and pooled RPC connections."""
+        # Stop background history prefetches before the sessions they use go away
+        await self.wallet_manager.aclose()
+        await self.security_suite.aclose()
+        await self.price_monitor.aclose()
+        self.neo_api.close()
+        await self.neo_api.aclose()
+    
     def add_to_history(self, role: str, content: str):
         """Add message to conversation history."""
-        self.conversation_history.append({
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now()
-        })
+        self.history_roles.append(role)
+        self.history_contents.append(content)
+        self.history_timestamps.append(time.time())
+    
+    def _history_iter(self) -> Iterator[Dict[str, Any]]:
+        """Iterate conversation history as role/content/timestamp dicts."""
+        for role, content, timestamp in zip(self.history_roles, self.history_contents, self.history_timestamps):
+            yield {"role": role, "content": content, "timestamp": timestamp}
+    
+    @property
+    def conversation_history(self) -> List[Dict[str, Any]]:
+        """Conversation history as a list of role/content/timestamp dicts."""
+        return list(self._history_iter())
     
     async def process_message(self, user_message: str) -> AgentResponse:
         """Process user message and return structured response."""
@@ -102,35 +676,17 @@ class NeoXBridgeComprehensiveAgent:
             intent = self.parse_intent(user_message)
             
             # Route to appropriate handler
-            if intent["type"] == "wallet_operations":
-                return await self.handle_wallet_operations(intent)
-            elif intent["type"] == "balance_check":
-                return await self.handle_balance_operations(intent)
-            elif intent["type"] == "security_analysis":
-                return await self.handle_security_analysis(intent)
-            elif intent["type"] == "blockchain_data":
-                return await self.handle_blockchain_data(intent)
-            elif intent["type"] == "nft_operations":
-                return await self.handle_nft_operations(intent)
-            elif intent["type"] == "price_monitoring":
-                return await self.handle_price_monitoring(intent)
-            elif intent["type"] == "send_transaction":
-                return await self.handle_send_transaction(intent)
-            elif intent["type"] == "bulk_transaction":
-                return await self.handle_bulk_transaction(intent)
-            elif intent["type"] == "transaction_help":
-                return self.get_transaction_help_response()
-            elif intent["type"] == "transaction_analysis":
-                return await self.handle_transaction_analysis(intent)
-            elif intent["type"] == "governance_info":
-                return await self.handle_governance_info(intent)
-            elif intent["type"] == "help":
-                return self.get_help_response()
-            else:
+            action = intent["type"]
+            handler = self._handlers.get(action)
+            if handler is None:
                 return self.handle_general_query(user_message)
+            
+            if action in self._async_handlers:
+                return await handler(intent)
+            return handler(intent)
                 
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
             return AgentResponse(
                 success=False,
                 message=f"❌ I encountered an error: {str(e)}. Please try again.",
@@ -138,132 +694,21 @@ class NeoXBridgeComprehensiveAgent:
             )
     
     def parse_intent(self, message: str) -> Dict[str, Any]:
-        """Parse user intent from message with comprehensive pattern matching."""
-        message_lower = message.lower()
-        
-        # Wallet operations
-        wallet_patterns = [
-            'load wallet', 'import wallet', 'wallet status', 'my address', 'private key'
-        ]
-        if any(pattern in message_lower for pattern in wallet_patterns):
-            # Extract private key if present
-            key_patterns = [
-                r'[KL][1-9A-HJ-NP-Za-km-z]{51}',  # WIF format
-                r'0x[a-fA-F0-9]{64}',  # Hex with 0x
-                r'\b[a-fA-F0-9]{64}\b'  # Raw hex
-            ]
-            
-            private_key = None
-            for pattern in key_patterns:
-                match = re.search(pattern, message)
-                if match:
-                    private_key = match.group()
-                    break
-                    
-            return {"type": "wallet_operations", "action": "load", "private_key": private_key}
-        
-        # Balance operations
-        balance_patterns = ['balance', 'check balance', 'my balance', 'show balance']
-        if any(pattern in message_lower for pattern in balance_patterns):
-            address_match = re.search(r'([Nn][A-Za-z0-9]{33})', message)
-            return {
-                "type": "balance_check", 
-                "address": address_match.group(1) if address_match else None
-            }
-        
-        # Security analysis
-        security_patterns = ['security', 'safe', 'malicious', 'check address', 'analyze']
-        if any(pattern in message_lower for pattern in security_patterns):
-            address_match = re.search(r'([Nn][A-Za-z0-9]{33})', message)
-            token_match = re.search(r'(0x[a-fA-F0-9]{40})', message)
-            url_match = re.search(r'https?://[^\s]+', message)
-            
-            target = None
-            target_type = "address"
-            
-            if address_match:
-                target = address_match.group(1)
-                target_type = "address"
-            elif token_match:
-                target = token_match.group(1)
-                target_type = "token"
-            elif url_match:
-                target = url_match.group()
-                target_type = "url"
-                
-            return {"type": "security_analysis", "target": target, "target_type": target_type}
-        
-        # Blockchain data
-        blockchain_patterns = ['block', 'transaction', 'tx', 'contract', 'asset info']
-        if any(pattern in message_lower for pattern in blockchain_patterns):
-            return {"type": "blockchain_data", "query": message}
-        
-        # NFT operations
-        nft_patterns = ['nft', 'nep11', 'collectible', 'non-fungible']
-        if any(pattern in message_lower for pattern in nft_patterns):
-            address_match = re.search(r'([Nn][A-Za-z0-9]{33})', message)
-            return {"type": "nft_operations", "address": address_match.group(1) if address_match else None}
-        
-        # Price monitoring
-        price_patterns = ['price', 'alert', 'monitor', 'track price']
-        if any(pattern in message_lower for pattern in price_patterns):
-            return {"type": "price_monitoring", "query": message}
-        
-        # Transaction operations (send/transfer)
-        send_patterns = ['send', 'transfer', 'pay']
-        if any(pattern in message_lower for pattern in send_patterns):
-            # Check for bulk/multiple recipient patterns
-            if 'bulk' in message_lower or 'multiple' in message_lower or ',' in message:
-                return {"type": "bulk_transaction", "query": message}
-            else:
-                # Single recipient transaction
-                # Parse: "send 5 NEO to NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N"
-                match = re.search(r'(?:send|transfer|pay)\s+(\d+(?:\.\d+)?)\s+(neo|gas)\s+to\s+([Nn][A-Za-z0-9]{33})', message_lower)
-                if match:
-                    return {
-                        "type": "send_transaction",
-                        "amount": float(match.group(1)),
-                        "asset": match.group(2).upper(),
-                        "recipient": match.group(3)
-                    }
-                else:
-                    return {"type": "transaction_help", "query": message}
-        
-        # Transaction analysis/history
-        tx_analysis_patterns = ['transaction history', 'tx history', 'recent transactions']
-        if any(pattern in message_lower for pattern in tx_analysis_patterns):
-            return {"type": "transaction_analysis", "query": message}
-        
-        # Governance
-        gov_patterns = ['governance', 'committee', 'candidate', 'vote', 'voting']
-        if any(pattern in message_lower for pattern in gov_patterns):
-            return {"type": "governance_info", "query": message}
-        
-        # Help
-        if message_lower in ['help', '?', 'commands', 'what can you do']:
-            return {"type": "help"}
-        
-        return {"type": "general", "message": message}
+        """Parse user intent from message, reusing results for repeated messages."""
+        # Never cache messages that may carry a private key
+        if _WALLET_RE.search(message):
+            return _match_intent(message)
+        return dict(_parse_intent_impl(message))
     
     async def handle_wallet_operations(self, intent: Dict[str, Any]) -> AgentResponse:
         """Handle wallet-related operations."""
         if intent.get("private_key"):
-            # Load wallet with private key
-            if self.wallet_manager.load_private_key(intent["private_key"]):
-                address = self.wallet_manager.get_address()
-                return AgentResponse(
-                    success=True,
-                    message=f"""✅ **Wallet Loaded Successfully!**
-                    
-📍 **Address:** `{address}`
-💼 **Network:** {self.network}
-🔐 **Status:** Ready for operations
-
-Available operations:
-• `check my balance` - View NEO/GAS balance
-• `my nfts` - View NFT collection  
-• `transaction history` - View recent transactions
-• `security check {address}` - Analyze address security""",
+            # Load wallet with private key
+            if self.wallet_manager.load_private_key(intent["private_key"]):
+                address = self.wallet_manager.get_address()
+                return AgentResponse(
+                    success=True,
+                    message=_WALLET_LOADED_TPL.format(address=address, network=self.network),
                     data={"address": address, "network": self.network},
                     action_type="wallet_loaded"
                 )
@@ -279,12 +724,11 @@ Available operations:
                 address = self.wallet_manager.get_address()
                 return AgentResponse(
                     success=True,
-                    message=f"""💼 **Wallet Status**
-                    
-🔸 **Address:** `{address}`
-🔸 **Network:** {self.network}
-🔸 **Status:** ✅ Loaded and ready
-🔸 **Neo3 Support:** {'✅ Available' if NEO3_AVAILABLE else '❌ Limited'}""",
+                    message=_WALLET_STATUS_TPL.format(
+                        address=address,
+                        network=self.network,
+                        neo3_status='✅ Available' if NEO3_AVAILABLE else '❌ Limited'
+                    ),
                     data={"address": address, "loaded": True},
                     action_type="wallet_status"
                 )
@@ -307,12 +751,11 @@ Available operations:
     
     async def handle_balance_operations(self, intent: Dict[str, Any]) -> AgentResponse:
         """Handle balance checking operations."""
-        target_address = intent.get("address")
+        wallet_address = self.wallet_manager.get_address()
         
         # Use wallet address if no specific address provided
-        if not target_address and self.wallet_manager.is_loaded:
-            target_address = self.wallet_manager.get_address()
-        elif not target_address:
+        target_address = intent.get("address") or wallet_address
+        if not target_address:
             return AgentResponse(
                 success=False,
                 message="Please provide an address or load your wallet first.\nExample: `balance for NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N`",
@@ -321,43 +764,40 @@ Available operations:
         
         try:
             # Try to get real balance from Neo API
-            balances = {"NEO": "0", "GAS": "0"}
+            balances = _NO_DEMO_BALANCE
             data_source = "demo"
             
             if NEO3_AVAILABLE:
                 try:
-                    balance_result = self.wallet_manager.get_balance() if target_address == self.wallet_manager.get_address() else None
+                    balance_result = self.wallet_manager.get_balance() if target_address == wallet_address else None
                     if balance_result:
                         balances = balance_result
                         data_source = "blockchain"
                 except Exception as e:
-                    logger.warning(f"Blockchain balance fetch failed: {e}")
+                    logger.warning("Blockchain balance fetch failed: %s", e)
             
             # Fallback to demo data
             if data_source == "demo":
-                balances = self.demo_balances.get(target_address, {"NEO": "0", "GAS": "0"})
+                balances = self.demo_balances.get(target_address, _NO_DEMO_BALANCE)
             
             source_emoji = "🌐" if data_source == "blockchain" else "🧪"
             
             return AgentResponse(
                 success=True,
-                message=f"""💰 **Balance for {target_address}**
-
-🔸 **NEO:** {balances['NEO']}
-🔸 **GAS:** {balances['GAS']}
-
-{source_emoji} **Source:** {data_source}_data
-📊 **Network:** {self.network}""",
+                message=_BALANCE_TPL.format(
+                    address=target_address,
+                    neo=balances['NEO'],
+                    gas=balances['GAS'],
+                    source_emoji=source_emoji,
+                    data_source=data_source,
+                    network=self.network
+                ),
                 data={"address": target_address, "balances": balances, "source": data_source},
                 action_type="balance_check"
             )
             
         except Exception as e:
-            return AgentResponse(
-                success=False,
-                message=f"❌ Failed to get balance: {str(e)}",
-                action_type="balance_error"
-            )
+            return _error_response(e, "Failed to get balance", "balance_error")
     
     async def handle_security_analysis(self, intent: Dict[str, Any]) -> AgentResponse:
         """Handle comprehensive security analysis."""
@@ -378,138 +818,129 @@ Please provide a target to analyze:
         
         try:
             # Perform comprehensive security check
-            security_result = await self.security_suite.comprehensive_security_check(target, target_type)
+            security_result = await self.security_suite.comprehensive_security_check(
+                target, target_type, force=intent.get("force", False)
+            )
             
             if security_result.is_safe:
-                risk_emoji = "✅"
-                status_text = "SAFE"
+                risk_emoji, status_text = _SAFE_STYLE
             else:
-                risk_emoji = "⚠️" if security_result.risk_level in ["medium", "high"] else "🚨"
-                status_text = f"RISK: {security_result.risk_level.upper()}"
+                risk_level = security_result.risk_level
+                risk_emoji, status_text = _RISK_STYLE.get(risk_level) or ("🚨", f"RISK: {risk_level.upper()}")
             
             return AgentResponse(
                 success=True,
-                message=f"""🛡️ **Security Analysis - {status_text}**
-
-{risk_emoji} **Target:** `{target}`
-🔸 **Type:** {target_type}
-🔸 **Risk Level:** {security_result.risk_level}
-🔸 **Confidence:** {security_result.confidence:.1%}
-🔸 **Checks Passed:** {security_result.checks_passed}/{security_result.total_checks}
-
-📊 **Analysis Details:**
-{self._format_security_details(security_result.details)}
-
-🕒 **Analyzed:** {security_result.timestamp.strftime('%Y-%m-%d %H:%M:%S')}""",
+                message=_SECURITY_ANALYSIS_TPL.format(
+                    status_text=status_text,
+                    risk_emoji=risk_emoji,
+                    target=target,
+                    target_type=target_type,
+                    risk_level=security_result.risk_level,
+                    confidence=security_result.confidence,
+                    checks_passed=security_result.checks_passed,
+                    total_checks=security_result.total_checks,
+                    details=self._format_security_details(security_result.details),
+                    analyzed_at=security_result.timestamp
+                ),
                 data=security_result,
                 action_type="security_analysis"
             )
             
         except Exception as e:
-            return AgentResponse(
-                success=False,
-                message=f"❌ Security analysis failed: {str(e)}",
-                action_type="security_error"
-            )
+            return _error_response(e, "Security analysis failed", "security_error")
     
     def _format_security_details(self, details: Dict[str, Any]) -> str:
         """Format security check details for display."""
-        formatted = []
-        for check_name, result in details.items():
-            if isinstance(result, dict):
-                status = "✅" if result.get("is_safe", True) else "❌"
-                message = result.get("message", result.get("status", "No details"))
-                formatted.append(f"• {check_name}: {status} {message}")
+        formatted = [
+            f"• {check_name}: {'✅' if result.get('is_safe', True) else '❌'} "
+            f"{result.get('message') or result.get('status') or 'No details'}"
+            for check_name, result in details.items()
+            if isinstance(result, dict)
+        ]
         
-        return "\n".join(formatted) if formatted else "• No detailed analysis available"
+        return "\n".join(formatted) or "• No detailed analysis available"
     
     async def handle_blockchain_data(self, intent: Dict[str, Any]) -> AgentResponse:
         """Handle blockchain data queries."""
-        query = intent.get("query", "").lower()
+        query = intent.get("query", "")
         
         try:
-            if "block" in query and "height" in query:
+            if _BLOCK_HEIGHT_RE.match(query):
                 # Get current block height
-                height = self.neo_api.get_block_count()
+                height = await self.neo_api.aget_block_count()
+                if not height:
+                    # 0 is the client's fallback for an error reply
+                    return AgentResponse(
+                        success=False,
+                        message=_ERR_BLOCK_HEIGHT_UNAVAILABLE_MSG,
+                        action_type="blockchain_error"
+                    )
                 return AgentResponse(
                     success=True,
-                    message=f"""📊 **Neo Blockchain Data**
-                    
-🔸 **Current Block Height:** {height:,}
-🔸 **Network:** {self.network}
-📡 **Node:** {self.neo_api.url}""",
+                    message=_BLOCK_HEIGHT_TPL.format(height=height, network=self.network, node_url=self.neo_api.url),
                     data={"block_height": height, "network": self.network},
                     action_type="blockchain_info"
                 )
             
-            elif "recent blocks" in query:
+            elif _RECENT_BLOCKS_RE.search(query):
                 # Get recent blocks
-                blocks = self.neo_api.get_recent_blocks(5)
+                blocks = await self.neo_api.aget_recent_blocks(5)
                 if "result" in blocks and blocks["result"]:
-                    block_list = []
-                    for block in blocks["result"][:5]:
-                        block_list.append(f"• Block #{block.get('index', 'Unknown')}: {block.get('transactioncount', 0)} transactions")
+                    parts = [_RECENT_BLOCKS_HEADER]
+                    parts.extend(
+                        f"• Block #{block.get('index', 'Unknown')}: {block.get('transactioncount', 0)} transactions\n"
+                        for block in blocks["result"][:5]
+                    )
+                    parts.append(_RECENT_BLOCKS_FOOTER_TPL.format(network=self.network))
                     
                     return AgentResponse(
                         success=True,
-                        message=f"""📊 **Recent Blocks**
-                        
-{chr(10).join(block_list)}
-
-🔸 **Network:** {self.network}""",
+                        message="".join(parts),
                         data=blocks,
                         action_type="blockchain_info"
                     )
             
-            elif "asset count" in query:
-                count = self.neo_api.get_asset_count()
+            elif _ASSET_COUNT_RE.search(query):
+                count = await self.neo_api.aget_asset_count()
                 return AgentResponse(
                     success=True,
-                    message=f"""📊 **Neo Asset Statistics**
-                    
-🔸 **Total Assets:** {count:,}
-🔸 **Network:** {self.network}
-💼 **Includes:** NEP-17 tokens, NEP-11 NFTs""",
+                    message=_ASSET_COUNT_TPL.format(count=count, network=self.network),
                     data={"asset_count": count},
                     action_type="blockchain_info"
                 )
             
             else:
                 # General blockchain info
-                height = self.neo_api.get_block_count()
-                asset_count = self.neo_api.get_asset_count()
+                height, asset_count = await asyncio.gather(
+                    self.neo_api.aget_block_count(),
+                    self.neo_api.aget_asset_count()
+                )
+                if not height:
+                    return AgentResponse(
+                        success=False,
+                        message=_ERR_BLOCK_HEIGHT_UNAVAILABLE_MSG,
+                        action_type="blockchain_error"
+                    )
                 
                 return AgentResponse(
                     success=True,
-                    message=f"""📊 **Neo Blockchain Overview**
-                    
-🔸 **Current Height:** {height:,}
-🔸 **Total Assets:** {asset_count:,}
-🔸 **Network:** {self.network}
-📡 **Status:** Online
-
-**Available queries:**
-• `recent blocks` - Show recent block info
-• `asset count` - Total number of assets
-• `block height` - Current blockchain height""",
+                    message=_BLOCKCHAIN_OVERVIEW_TPL.format(
+                        height=height,
+                        asset_count=asset_count,
+                        network=self.network
+                    ),
                     data={"height": height, "asset_count": asset_count},
                     action_type="blockchain_info"
                 )
                 
         except Exception as e:
-            return AgentResponse(
-                success=False,
-                message=f"❌ Failed to get blockchain data: {str(e)}",
-                action_type="blockchain_error"
-            )
+            return _error_response(e, "Failed to get blockchain data", "blockchain_error")
     
     async def handle_nft_operations(self, intent: Dict[str, Any]) -> AgentResponse:
         """Handle NFT-related operations."""
-        address = intent.get("address")
-        
-        if not address and self.wallet_manager.is_loaded:
-            address = self.wallet_manager.get_address()
-        elif not address:
+        # Use wallet address if no specific address provided
+        address = intent.get("address") or self.wallet_manager.get_address()
+        if not address:
             return AgentResponse(
                 success=False,
                 message="Please provide an address or load your wallet first.\nExample: `my nfts` or `nfts for Nxxx...`",
@@ -518,81 +949,57 @@ Please provide a target to analyze:
         
         try:
             # Get NFT collection
-            nft_data = self.neo_api.get_nep11_owned(address)
+            nft_data = await self.neo_api.aget_nep11_owned(address)
             
             if "result" in nft_data and nft_data["result"]:
                 nft_count = len(nft_data["result"])
                 
-                # Group by contract
-                contracts = {}
-                for nft in nft_data["result"][:10]:  # Show first 10
-                    contract = nft.get("contract", "Unknown")
-                    if contract not in contracts:
-                        contracts[contract] = 0
-                    contracts[contract] += 1
-                
-                contract_list = []
-                for contract, count in contracts.items():
-                    contract_list.append(f"• {contract}: {count} NFT(s)")
+                # Group all NFTs by contract, listing the 10 largest collections
+                contracts = Counter(nft.get("contract", "Unknown") for nft in nft_data["result"])
+                parts = [_NFT_COLLECTION_HEADER_TPL.format(address=address, nft_count=nft_count)]
+                parts.extend(f"• {contract}: {count} NFT(s)\n" for contract, count in contracts.most_common(10))
+                parts.append(_NFT_COLLECTION_FOOTER_TPL.format(network=self.network))
                 
                 return AgentResponse(
                     success=True,
-                    message=f"""🎨 **NFT Collection for {address}**
-                    
-🔸 **Total NFTs:** {nft_count}
-📦 **Collections:**
-
-{chr(10).join(contract_list)}
-
-🌐 **Network:** {self.network}""",
+                    message="".join(parts),
                     data={"address": address, "nft_count": nft_count, "contracts": contracts},
                     action_type="nft_info"
                 )
             else:
                 return AgentResponse(
                     success=True,
-                    message=f"""🎨 **NFT Collection for {address}**
-                    
-🔸 **Total NFTs:** 0
-📦 **Collections:** None found
-
-🌐 **Network:** {self.network}""",
+                    message=_NFT_EMPTY_TPL.format(address=address, network=self.network),
                     data={"address": address, "nft_count": 0},
                     action_type="nft_info"
                 )
                 
         except Exception as e:
-            return AgentResponse(
-                success=False,
-                message=f"❌ Failed to get NFT data: {str(e)}",
-                action_type="nft_error"
-            )
+            return _error_response(e, "Failed to get NFT data", "nft_error")
     
     async def handle_price_monitoring(self, intent: Dict[str, Any]) -> AgentResponse:
         """Handle price monitoring and alerts."""
-        query = intent.get("query", "").lower()
+        query = intent.get("query", "")
         
         try:
-            if "create alert" in query or "price alert" in query:
+            if _CREATE_ALERT_RE.search(query):
                 # Parse price alert creation
                 # Example: "create price alert NEO above 50"
-                match = re.search(r'(neo|gas|bitcoin|ethereum)\s+(above|below)\s+([\d.]+)', query)
+                match = _PRICE_ALERT_RE.search(query)
                 if match:
                     symbol, condition, price = match.groups()
                     price = float(price)
                     
-                    alert = self.price_monitor.create_price_alert(symbol.upper(), price, condition)
+                    alert = self.price_monitor.create_price_alert(symbol.upper(), price, condition.lower())
                     
                     return AgentResponse(
                         success=True,
-                        message=f"""🚨 **Price Alert Created**
-                        
-🔸 **Symbol:** {alert.symbol}
-🔸 **Condition:** {alert.condition} ${alert.target_price}
-🔸 **Status:** Active
-🔸 **Created:** {alert.created_at.strftime('%Y-%m-%d %H:%M:%S')}
-
-I'll monitor the price and notify you when triggered!""",
+                        message=_PRICE_ALERT_CREATED_TPL.format(
+                            symbol=alert.symbol,
+                            condition=alert.condition,
+                            target_price=alert.target_price,
+                            created_at=alert.created_at
+                        ),
                         data=alert,
                         action_type="price_alert_created"
                     )
@@ -610,7 +1017,7 @@ I'll monitor the price and notify you when triggered!""",
                         action_type="price_help"
                     )
             
-            elif "check alerts" in query or "my alerts" in query:
+            elif _LIST_ALERTS_RE.search(query):
                 active_alerts = self.price_monitor.get_active_alerts()
                 
                 if active_alerts:
@@ -620,11 +1027,7 @@ I'll monitor the price and notify you when triggered!""",
                     
                     return AgentResponse(
                         success=True,
-                        message=f"""🚨 **Active Price Alerts**
-                        
-{chr(10).join(alert_list)}
-
-🔸 **Total Active:** {len(active_alerts)}""",
+                        message=_ACTIVE_ALERTS_TPL.format(alerts="\n".join(alert_list), total=len(active_alerts)),
                         data={"alerts": active_alerts},
                         action_type="price_alerts"
                     )
@@ -652,11 +1055,7 @@ I'll monitor the price and notify you when triggered!""",
                 )
                 
         except Exception as e:
-            return AgentResponse(
-                success=False,
-                message=f"❌ Price monitoring error: {str(e)}",
-                action_type="price_error"
-            )
+            return _error_response(e, "Price monitoring error", "price_error")
     
     async def handle_send_transaction(self, intent: Dict[str, Any]) -> AgentResponse:
         """Handle single recipient transaction operations."""
@@ -701,9 +1100,17 @@ To send transactions, you need to load your wallet first:
             # Get sender info
             sender_address = self.wallet_manager.get_address()
             
-            # Check sender balance
-            sender_balance = self.wallet_manager.get_balance() if NEO3_AVAILABLE else self.demo_balances.get(sender_address, {"NEO": "0", "GAS": "0"})
-            current_balance = float(sender_balance.get(asset, "0"))
+            # Fetch sender balance and screen the recipient concurrently
+            security_check = self.security_suite.comprehensive_security_check(recipient, "address")
+            if NEO3_AVAILABLE:
+                sender_balance, security_result = await asyncio.gather(
+                    asyncio.get_running_loop().run_in_executor(None, self.wallet_manager.get_balance),
+                    security_check
+                )
+                current_balance = float(sender_balance.get(asset, "0"))
+            else:
+                current_balance = self.demo_balances.get(sender_address, _NO_DEMO_BALANCE).get(asset, 0.0)
+                security_result = await security_check
             
             # Validate sufficient balance (including network fee)
             network_fee = 0.5  # Standard network fee
@@ -712,42 +1119,40 @@ To send transactions, you need to load your wallet first:
             if current_balance < required_amount:
                 return AgentResponse(
                     success=False,
-                    message=f"""💸 **Insufficient Balance**
-                    
-❌ **Transaction cannot proceed**
-
-🔸 **Required:** {required_amount} {asset} ({amount} + {network_fee if asset == 'GAS' else 0} fee)
-🔸 **Available:** {current_balance} {asset}
-🔸 **Shortage:** {required_amount - current_balance} {asset}
-
-Please ensure you have sufficient balance and try again.""",
+                    message=_INSUFFICIENT_BALANCE_TPL.format(
+                        required_amount=required_amount,
+                        asset=asset,
+                        amount=amount,
+                        fee=network_fee if asset == 'GAS' else 0,
+                        current_balance=current_balance,
+                        shortage=required_amount - current_balance
+                    ),
                     action_type="transaction_error"
                 )
             
-            # Perform security check on recipient
-            security_result = await self.security_suite.comprehensive_security_check(recipient, "address")
-            
             # Prepare transaction preview
-            preview_message = f"""💸 **Transaction Preview**
-            
-📤 **From:** `{sender_address}`
-📥 **To:** `{recipient}`
-💰 **Amount:** {amount} {asset}
-⛽ **Network Fee:** {network_fee} GAS
-🔸 **Total Cost:** {amount} {asset}{' + ' + str(network_fee) + ' GAS' if asset != 'GAS' else ''}
-
-🛡️ **Security Status:** {'✅ SAFE' if security_result.is_safe else '⚠️ RISKS DETECTED'}
-
-**This is a PREVIEW. To execute the transaction, confirm by typing:**
-`confirm send {amount} {asset} to {recipient}`"""
+            parts = [_TRANSACTION_PREVIEW_TPL.format(
+                sender_address=sender_address,
+                recipient=recipient,
+                amount=amount,
+                asset=asset,
+                network_fee=network_fee,
+                extra_fee=f" + {network_fee} GAS" if asset != "GAS" else "",
+                security_status='✅ SAFE' if security_result.is_safe else '⚠️ RISKS DETECTED'
+            )]
             
             if not security_result.is_safe:
-                preview_message += f"\n\n🚨 **SECURITY WARNING:** {security_result.risk_level.upper()} risk detected!"
-                preview_message += f"\n🔸 **Risk Details:** {', '.join([detail.get('message', 'Unknown risk') for detail in security_result.details.values() if isinstance(detail, dict) and not detail.get('is_safe', True)])}"
+                parts.append(f"\n\n🚨 **SECURITY WARNING:** {security_result.risk_level.upper()} risk detected!")
+                parts.append("\n🔸 **Risk Details:** ")
+                parts.append(", ".join(
+                    detail.get('message', 'Unknown risk')
+                    for detail in security_result.details.values()
+                    if isinstance(detail, dict) and not detail.get('is_safe', True)
+                ))
             
             return AgentResponse(
                 success=True,
-                message=preview_message,
+                message="".join(parts),
                 data={
                     "transaction_preview": {
                         "from": sender_address,
@@ -762,47 +1167,20 @@ Please ensure you have sufficient balance and try again.""",
             )
             
         except Exception as e:
-            return AgentResponse(
-                success=False,
-                message=f"❌ Transaction preparation failed: {str(e)}",
-                action_type="transaction_error"
-            )
+            return _error_response(e, "Transaction preparation failed", "transaction_error")
     
     async def handle_bulk_transaction(self, intent: Dict[str, Any]) -> AgentResponse:
         """Handle bulk/multiple recipient transactions."""
         if not self.wallet_manager.is_loaded:
             return AgentResponse(
                 success=False,
-                message="""💸 **Bulk Transaction Error**
-                
-❌ **Wallet not loaded**
-
-To send bulk transactions, load your wallet first:
-`load wallet YOUR_PRIVATE_KEY`""",
+                message=_BULK_TX_WALLET_ERROR_MSG,
                 action_type="transaction_error"
             )
         
         return AgentResponse(
             success=True,
-            message="""💸 **Bulk Transaction Feature**
-            
-🚀 **Coming Soon!** Bulk transactions will allow you to:
-
-• Send to multiple recipients in one transaction
-• Batch payments with reduced fees
-• Mass airdrops and distributions
-• Multi-recipient smart contract calls
-
-**Example Usage (Future):**
-```
-bulk send NEO:
-  NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N: 5
-  NhGomKyZgSuYUGqrXHcpv1bNH9ntwvfm4c: 3
-  NUVPACMnKFhpuHjsRjhUvXz1XhqfGZYVtY: 2
-```
-
-For now, use individual transactions:
-`send 5 NEO to ADDRESS`""",
+            message=_BULK_TX_PREVIEW_MSG,
             action_type="feature_preview"
         )
     
@@ -810,64 +1188,24 @@ For now, use individual transactions:
         """Get transaction help information."""
         return AgentResponse(
             success=True,
-            message="""💸 **Transaction Commands Help**
-
-🚀 **Send Tokens:**
-• `send AMOUNT ASSET to ADDRESS` - Send NEO/GAS
-• `transfer 5 NEO to NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N`
-• `pay 10.5 GAS to NhGomKyZgSuYUGqrXHcpv1bNH9ntwvfm4c`
-
-🔐 **Requirements:**
-• Wallet must be loaded first
-• Sufficient balance (including network fees)
-• Valid recipient address
-
-🛡️ **Security Features:**
-• Automatic recipient address validation
-• Comprehensive security checks via GoPlusLabs
-• Balance verification before sending
-• Transaction preview and confirmation
-
-💡 **Supported Assets:**
-• NEO (indivisible - whole numbers only)
-• GAS (divisible - decimal amounts allowed)
-
-**Examples:**
-```
-load wallet YOUR_PRIVATE_KEY
-check my balance
-send 5 NEO to NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N
-transfer 2.5 GAS to NhGomKyZgSuYUGqrXHcpv1bNH9ntwvfm4c
-```""",
+            message=_TX_HELP_MSG,
             action_type="transaction_help"
         )
     
     async def handle_transaction_analysis(self, intent: Dict[str, Any]) -> AgentResponse:
         """Handle transaction analysis operations."""
-        query = intent.get("query", "").lower()
+        query = intent.get("query", "")
         
         try:
             if self.wallet_manager.is_loaded:
                 address = self.wallet_manager.get_address()
                 
                 # Get transaction history
-                tx_history = self.wallet_manager.get_transaction_history()
+                tx_history = await self.wallet_manager.get_transaction_history()
                 
                 return AgentResponse(
                     success=True,
-                    message=f"""📊 **Transaction Analysis for {address}**
-                    
-🔸 **NEP-17 Transfers:** Available
-🔸 **NEP-11 Transfers:** Available
-🔸 **Network:** {self.network}
-
-**Recent activity analysis would show:**
-• Transaction volume patterns
-• Most frequent interactions
-• Token transfer history
-• NFT activity
-
-*Full analysis requires blockchain API integration*""",
+                    message=_render_tx_analysis(address, self.network),
                     data={"address": address, "history": tx_history},
                     action_type="transaction_analysis"
                 )
@@ -879,106 +1217,38 @@ transfer 2.5 GAS to NhGomKyZgSuYUGqrXHcpv1bNH9ntwvfm4c
                 )
                 
         except Exception as e:
-            return AgentResponse(
-                success=False,
-                message=f"❌ Transaction analysis error: {str(e)}",
-                action_type="transaction_error"
-            )
+            return _error_response(e, "Transaction analysis error", "transaction_error")
     
     async def handle_governance_info(self, intent: Dict[str, Any]) -> AgentResponse:
         """Handle Neo governance information."""
         try:
-            # Get committee info
-            committee = self.neo_api.get_committee()
-            candidate_count = self.neo_api.get_candidate_count()
+            # Get committee info and candidate count in one batched request
+            committee, candidate_count = await self.neo_api.aget_governance_info()
             
             if "result" in committee and committee["result"]:
                 committee_size = len(committee["result"])
                 
                 return AgentResponse(
                     success=True,
-                    message=f"""🏛️ **Neo Governance Information**
-                    
-🔸 **Committee Members:** {committee_size}
-🔸 **Total Candidates:** {candidate_count}
-🔸 **Network:** {self.network}
-
-**Governance Features:**
-• Committee member voting
-• Candidate registration
-• Voting power delegation
-• Network parameter changes
-
-Use `candidate info ADDRESS` for specific candidate details.""",
+                    message=_render_governance(committee_size, candidate_count, self.network),
                     data={"committee_size": committee_size, "candidate_count": candidate_count},
                     action_type="governance_info"
                 )
             else:
                 return AgentResponse(
                     success=False,
-                    message="❌ Could not retrieve governance information",
+                    message=_ERR_GOVERNANCE_UNAVAILABLE_MSG,
                     action_type="governance_error"
                 )
                 
         except Exception as e:
-            return AgentResponse(
-                success=False,
-                message=f"❌ Governance query error: {str(e)}",
-                action_type="governance_error"
-            )
+            return _error_response(e, "Governance query error", "governance_error")
     
     def get_help_response(self) -> AgentResponse:
         """Get comprehensive help information."""
         return AgentResponse(
             success=True,
-            message="""🤖 **NeoXBridge AI - Complete Command Reference**
-
-🔐 **Wallet Management:**
-• `load wallet PRIVATE_KEY` - Load your Neo wallet
-• `wallet status` - Check wallet status
-• `my address` - Show wallet address
-
-💰 **Balance & Assets:**
-• `check my balance` - Check your balance
-• `balance for ADDRESS` - Check any address
-• `my nfts` - View your NFT collection
-
-🛡️ **Security Analysis:**
-• `security check ADDRESS` - Analyze address safety
-• `analyze token CONTRACT` - Token security analysis
-• `security check URL` - Website safety check
-
-📊 **Blockchain Data:**
-• `block height` - Current blockchain height
-• `recent blocks` - Recent block information
-• `asset count` - Total assets on network
-
-📈 **Price Monitoring:**
-• `create price alert SYMBOL above/below PRICE` - Create alert
-• `check my alerts` - View active alerts
-• `neo price` - Get current prices
-
-💸 **Token Transfers:**
-• `send AMOUNT ASSET to ADDRESS` - Send tokens securely
-• `transfer 5 NEO to ADDRESS` - Transfer NEO tokens  
-• `pay 10.5 GAS to ADDRESS` - Send GAS payments
-• `send help` - Transaction help and examples
-
-🏛️ **Governance:**
-• `committee info` - Neo committee information
-• `candidate count` - Total candidates
-
-💡 **System:**
-• `help` - Show this help
-• `quit` - Exit application
-
-**Example Usage:**
-```
-load wallet KxcgHRTc8SUcvwkG7V8HLoFrPHkUMskeV9nx5fvuTbsEU3z3kAS2
-check my balance
-security check NiEtVMWVYgpXrWkRTMwRaMJtJ41gD3912N
-create price alert NEO above 50
-```""",
+            message=_HELP_MSG,
             action_type="help"
         )
     
@@ -986,85 +1256,91 @@ create price alert NEO above 50
         """Handle general queries and provide guidance."""
         return AgentResponse(
             success=True,
-            message="""🌉 **Welcome to NeoXBridge AI!**
-
-I'm your comprehensive Neo blockchain assistant with advanced capabilities:
-
-🔸 **Complete Neo N3 integration** - Real blockchain data
-🔸 **Advanced security analysis** - Multi-layer protection
-🔸 **Price monitoring & alerts** - Never miss market moves
-🔸 **NFT tracking & analysis** - Full collectible management
-🔸 **Governance insights** - Committee and voting data
-
-Type `help` for all commands, or try:
-• `load wallet YOUR_PRIVATE_KEY`
-• `security check ADDRESS`
-• `create price alert NEO above 50`
-
-What would you like to explore?""",
+            message=_WELCOME_MSG,
             action_type="welcome"
         )
 
 async def main():
     """Main application loop with enhanced error handling."""
+    # Run tasks eagerly so coroutines that finish without suspending skip a loop hop (Python 3.12+)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     print("🌉 NeoXBridge AI - Comprehensive Blockchain Assistant")
     print("=" * 65)
     print("Initializing comprehensive Neo blockchain agent...")
     
-    # Initialize agent
+    # One keep-alive HTTP session for the whole run, closed on exit
+    session = _create_http_session()
+    agent = None
     try:
-        agent = NeoXBridgeComprehensiveAgent()
-        print("\n✅ NeoXBridge AI Ready!")
-        
-        if agent.wallet_manager.is_loaded:
-            print(f"💼 Auto-loaded wallet: {agent.wallet_manager.get_address()}")
-        
-        print(f"🌐 Network: {agent.network}")
-        print(f"🔧 Neo3 Support: {'Available' if NEO3_AVAILABLE else 'Limited'}")
-        print("\nType 'help' for commands or 'quit' to exit")
-        print("-" * 65)
-        
-    except Exception as e:
-        print(f"❌ Failed to initialize agent: {e}")
-        return
-    
-    # Main interaction loop
-    while True:
+        # Initialize agent
         try:
-            user_input = input("\n💬 You: ").strip()
-            
-            if user_input.lower() in ['quit', 'exit', 'bye']:
-                print("👋 Thank you for using NeoXBridge AI! Stay secure in the blockchain world!")
-                break
-                
-            if not user_input:
-                continue
-            
-            print("🤔 Processing your request...")
-            
-            # Process message and get response
-            response = await agent.process_message(user_input)
+            agent = NeoXBridgeComprehensiveAgent(session=session)
+            print("\n✅ NeoXBridge AI Ready!")
             
-            # Display response
-            success_emoji = "✅" if response.success else "❌"
-            print(f"\n🤖 NeoXBridge AI {success_emoji}:")
-            print(response.message)
+            if agent.wallet_manager.is_loaded:
+                print(f"💼 Auto-loaded wallet: {agent.wallet_manager.get_address()}")
             
-            # Log action type for debugging
-            logger.debug(f"Action type: {response.action_type}")
+            print(f"🌐 Network: {agent.network}")
+            print(f"🔧 Neo3 Support: {'Available' if NEO3_AVAILABLE else 'Limited'}")
+            print("\nType 'help' for commands or 'quit' to exit")
+            print("-" * 65)
             
-        except KeyboardInterrupt:
-            print("\n\n👋 Session ended. Goodbye!")
-            break
         except Exception as e:
-            print(f"\n❌ System Error: {e}")
-            logger.error(f"Main loop error: {e}")
+            print(f"❌ Failed to initialize agent: {e}")
+            return
+        
+        # Main interaction loop
+        while True:
+            try:
+                user_input = (await _ainput(_PROMPT)).strip()
+                
+                # Only short inputs can be exit commands; skip casefolding longer prompts
+                if len(user_input) <= _EXIT_COMMAND_MAX_LEN and user_input.casefold() in _EXIT_COMMANDS:
+                    print("👋 Thank you for using NeoXBridge AI! Stay secure in the blockchain world!")
+                    break
+                    
+                if not user_input:
+                    continue
+                
+                print(_PROCESSING_MSG, flush=True)
+                
+                # Process message and get response
+                response = await agent.process_message(user_input)
+                
+                # Display response as one buffered write per turn
+                parts = [_RESPONSE_HEADER, _STATUS_EMOJI[response.success], ":\n", response.message, "\n"]
+                sys.stdout.write("".join(parts))
+                sys.stdout.flush()
+                
+                # Log action type for debugging
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Action type: %s", response.action_type)
+                
+            except KeyboardInterrupt:
+                print("\n\n👋 Session ended. Goodbye!")
+                break
+            except Exception as e:
+                print(f"\n❌ System Error: {e}")
+                logger.error("Main loop error: %s", e)
+        
+    finally:
+        if agent is not None:
+            await agent.close()
+        await session.close()
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        # uvloop.run (uvloop 0.18+) replaces the install() policy hook deprecated on Python 3.12+
+        if UVLOOP_AVAILABLE and hasattr(uvloop, "run"):
+            uvloop.run(main())
+        else:
+            if UVLOOP_AVAILABLE:
+                uvloop.install()  # older uvloop without run()
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\nApplication terminated by user")
     except Exception as e:
-        logger.error(f"Application crashed: {e}")
+        logger.error("Application crashed: %s", e)
         print(f"\n💥 Fatal error: {e}")
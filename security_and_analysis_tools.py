@@ -9,7 +9,8 @@ import logging
 import json
 import hashlib
 import hmac
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Set, Tuple, Union
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 import os
@@ -61,18 +62,27 @@ class PriceAlert:
 class GoPlusLabsClient:
     """Comprehensive GoPlusLabs security API client."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, session: Optional[aiohttp.ClientSession] = None):
         self.api_key = api_key or os.getenv("GOPLUS_API_KEY") or os.getenv("GO_PLUS_LABS_APP_KEY")
         self.base_url = "https://api.gopluslabs.io"
-        self.session = None
+        # An injected session is shared with other clients and never closed here
+        self.session = session
+        self._owns_session = session is None
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if not self.session or self.session.closed:
+            self.session = aiohttp.ClientSession()
+            self._owns_session = True
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the HTTP session if this client created it."""
+        if self._owns_session and self.session:
             await self.session.close()
+            self.session = None
     
     def _get_headers(self) -> Dict[str, str]:
         """Get API headers."""
@@ -83,8 +93,9 @@ class GoPlusLabsClient:
     
     async def _make_request(self, endpoint: str, params: Dict = None) -> Dict[str, Any]:
         """Make API request to GoPlusLabs."""
-        if not self.session:
+        if not self.session or self.session.closed:
             self.session = aiohttp.ClientSession()
+            self._owns_session = True
         
         url = f"{self.base_url}{endpoint}"
         headers = self._get_headers()
@@ -102,6 +113,14 @@ class GoPlusLabsClient:
     
     async def check_token_security(self, token_address: str, chain_id: str = "1") -> TokenAnalysis:
         """Comprehensive token security analysis."""
+        token_analysis = await self._lookup_token_security(token_address, chain_id)
+        if token_analysis is None:
+            # Return safe defaults if analysis fails
+            return self._default_token_analysis(token_address)
+        return token_analysis
+    
+    async def _lookup_token_security(self, token_address: str, chain_id: str = "1") -> Optional[TokenAnalysis]:
+        """Token security analysis, or None when the API returned no data for the token."""
         endpoint = f"/api/v1/token_security/{chain_id}"
         params = {"contract_addresses": token_address}
         
@@ -127,25 +146,28 @@ class GoPlusLabsClient:
                 anti_whale=token_data.get("anti_whale_modifiable") == "1",
                 trading_cooldown=token_data.get("trading_cooldown") == "1"
             )
-        else:
-            # Return safe defaults if analysis fails
-            return TokenAnalysis(
-                token_address=token_address,
-                symbol="UNKNOWN",
-                name="Unknown Token",
-                is_honeypot=False,
-                can_sell=True,
-                honeypot_reason=None,
-                buy_tax=0.0,
-                sell_tax=0.0,
-                slippage_modifiable=False,
-                is_proxy=False,
-                is_mintable=False,
-                owner_change_balance=False,
-                hidden_owner=False,
-                anti_whale=False,
-                trading_cooldown=False
-            )
+        return None
+    
+    @staticmethod
+    def _default_token_analysis(token_address: str) -> TokenAnalysis:
+        """Safe defaults reported when token analysis fails."""
+        return TokenAnalysis(
+            token_address=token_address,
+            symbol="UNKNOWN",
+            name="Unknown Token",
+            is_honeypot=False,
+            can_sell=True,
+            honeypot_reason=None,
+            buy_tax=0.0,
+            sell_tax=0.0,
+            slippage_modifiable=False,
+            is_proxy=False,
+            is_mintable=False,
+            owner_change_balance=False,
+            hidden_owner=False,
+            anti_whale=False,
+            trading_cooldown=False
+        )
     
     async def check_address_security(self, address: str) -> Dict[str, Any]:
         """Check address for malicious activity."""
@@ -166,19 +188,27 @@ class GoPlusLabsClient:
     
     async def check_dapp_security(self, url: str) -> Dict[str, Any]:
         """Check dApp/website security."""
+        return await self._lookup_dapp_security(url) or {}
+    
+    async def _lookup_dapp_security(self, url: str) -> Optional[Dict[str, Any]]:
+        """dApp/website security result, or None when the request failed."""
         endpoint = "/api/v1/dapp_security"
         params = {"url": url}
         
         result = await self._make_request(endpoint, params)
-        return result.get("result", {})
+        return result.get("result", {}) if "error" not in result else None
     
     async def check_phishing_site(self, url: str) -> Dict[str, Any]:
         """Check if URL is a phishing site."""
+        return await self._lookup_phishing_site(url) or {}
+    
+    async def _lookup_phishing_site(self, url: str) -> Optional[Dict[str, Any]]:
+        """Phishing site result, or None when the request failed."""
         endpoint = "/api/v1/phishing_site"
         params = {"url": url}
         
         result = await self._make_request(endpoint, params)
-        return result.get("result", {})
+        return result.get("result", {}) if "error" not in result else None
     
     async def decode_signature_data(self, chain_id: str, data: str) -> Dict[str, Any]:
         """Decode transaction signature data."""
@@ -199,21 +229,47 @@ class GoPlusLabsClient:
 class CryptoPriceMonitor:
     """Cryptocurrency price monitoring and alerting system."""
     
-    def __init__(self):
-        self.alerts: List[PriceAlert] = []
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        # Alerts keyed by (symbol, target_price, condition), plus the keys still watched per symbol
+        self._alerts: Dict[Tuple[str, float, str], PriceAlert] = {}
+        self._by_symbol: Dict[str, Set[Tuple[str, float, str]]] = {}
         self.price_cache: Dict[str, Dict] = {}
         self.cache_expiry = 60  # seconds
+        # An injected session is shared with other clients and never closed here
+        self.session = session
+        self._owns_session = session is None
         
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled HTTP session, creating an owned one on first use."""
+        if not self.session or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=64, ttl_dns_cache=300)
+            )
+            self._owns_session = True
+        return self.session
+    
+    async def aclose(self):
+        """Close the HTTP session if this monitor created it."""
+        if self._owns_session and self.session:
+            await self.session.close()
+            self.session = None
+    
+    def _cached_price(self, symbol: str, vs_currency: str, now: datetime) -> Optional[float]:
+        """Return the cached price if it is younger than cache_expiry."""
+        cached_data = self.price_cache.get(f"{symbol}_{vs_currency}")
+        if cached_data and (now - cached_data["timestamp"]).total_seconds() < self.cache_expiry:
+            return cached_data["price"]
+        return None
+    
     async def get_token_price(self, symbol: str, vs_currency: str = "usd") -> Optional[float]:
         """Get current token price from CoinGecko API."""
         cache_key = f"{symbol}_{vs_currency}"
         now = datetime.now()
         
         # Check cache first
-        if cache_key in self.price_cache:
-            cached_data = self.price_cache[cache_key]
-            if (now - cached_data["timestamp"]).seconds < self.cache_expiry:
-                return cached_data["price"]
+        cached_price = self._cached_price(symbol, vs_currency, now)
+        if cached_price is not None:
+            return cached_price
         
         try:
             url = f"https://api.coingecko.com/api/v3/simple/price"
@@ -223,28 +279,78 @@ class CryptoPriceMonitor:
                 "include_24hr_change": "true"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if symbol.lower() in data:
-                            price = data[symbol.lower()][vs_currency]
+            session = self._get_session()
+            async with session.get(url, params=params, timeout=10) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if symbol.lower() in data:
+                        price = data[symbol.lower()][vs_currency]
+                        
+                        # Cache the result
+                        self.price_cache[cache_key] = {
+                            "price": price,
+                            "timestamp": now,
+                            "change_24h": data[symbol.lower()].get(f"{vs_currency}_24h_change", 0)
+                        }
+                        
+                        return price
+        except Exception as e:
+            logger.error(f"Failed to get price for {symbol}: {e}")
+        
+        return None
+    
+    async def fetch_prices_bulk(self, symbols: List[str], vs_currency: str = "usd") -> Dict[str, float]:
+        """Get current prices for several tokens with one CoinGecko request."""
+        if not symbols:
+            return {}
+        
+        ids = {symbol: symbol.lower() for symbol in symbols}
+        prices = {}
+        now = datetime.now()
+        
+        try:
+            url = "https://api.coingecko.com/api/v3/simple/price"
+            params = {
+                "ids": ",".join(sorted(set(ids.values()))),
+                "vs_currencies": vs_currency,
+                "include_24hr_change": "true"
+            }
+            
+            session = self._get_session()
+            async with session.get(url, params=params, timeout=10) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    for symbol, coin_id in ids.items():
+                        if coin_id in data and vs_currency in data[coin_id]:
+                            price = data[coin_id][vs_currency]
+                            prices[symbol] = price
                             
                             # Cache the result
-                            self.price_cache[cache_key] = {
+                            self.price_cache[f"{symbol}_{vs_currency}"] = {
                                 "price": price,
                                 "timestamp": now,
-                                "change_24h": data[symbol.lower()].get(f"{vs_currency}_24h_change", 0)
+                                "change_24h": data[coin_id].get(f"{vs_currency}_24h_change", 0)
                             }
-                            
-                            return price
         except Exception as e:
-            logger.error(f"Failed to get price for {symbol}: {e}")
+            logger.error(f"Failed to get prices for {', '.join(symbols)}: {e}")
         
-        return None
+        return prices
+    
+    @property
+    def alerts(self) -> List[PriceAlert]:
+        """All price alerts in creation order."""
+        return list(self._alerts.values())
+    
+    def _unwatch(self, key: Tuple[str, float, str]):
+        """Stop checking prices for an alert key."""
+        keys = self._by_symbol.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_symbol[key[0]]
     
     def create_price_alert(self, symbol: str, target_price: float, condition: str) -> PriceAlert:
-        """Create a new price alert."""
+        """Create a new price alert; an identical alert is re-armed rather than duplicated."""
         alert = PriceAlert(
             symbol=symbol.upper(),
             target_price=target_price,
@@ -253,7 +359,9 @@ class CryptoPriceMonitor:
             created_at=datetime.now()
         )
         
-        self.alerts.append(alert)
+        key = (alert.symbol, target_price, alert.condition)
+        self._alerts[key] = alert
+        self._by_symbol.setdefault(alert.symbol, set()).add(key)
         logger.info(f"Created price alert: {symbol} {condition} {target_price}")
         return alert
     
@@ -261,39 +369,54 @@ class CryptoPriceMonitor:
         """Check all active alerts and return triggered ones."""
         triggered_alerts = []
         
-        for alert in self.alerts:
-            if not alert.active or alert.triggered_at:
-                continue
-            
-            current_price = await self.get_token_price(alert.symbol)
+        # Serve fresh cached prices and fetch the rest in a single request
+        now = datetime.now()
+        prices = {}
+        stale_symbols = []
+        for symbol in self._by_symbol:
+            cached_price = self._cached_price(symbol, "usd", now)
+            if cached_price is None:
+                stale_symbols.append(symbol)
+            else:
+                prices[symbol] = cached_price
+        prices.update(await self.fetch_prices_bulk(stale_symbols))
+        
+        for symbol, keys in list(self._by_symbol.items()):
+            current_price = prices.get(symbol)
             if current_price is None:
                 continue
             
-            should_trigger = False
-            if alert.condition == "above" and current_price >= alert.target_price:
-                should_trigger = True
-            elif alert.condition == "below" and current_price <= alert.target_price:
-                should_trigger = True
-            
-            if should_trigger:
-                alert.triggered_at = datetime.now()
-                alert.active = False
-                triggered_alerts.append(alert)
-                logger.info(f"Price alert triggered: {alert.symbol} is {current_price}")
+            for key in list(keys):
+                alert = self._alerts[key]
+                should_trigger = False
+                if alert.condition == "above" and current_price >= alert.target_price:
+                    should_trigger = True
+                elif alert.condition == "below" and current_price <= alert.target_price:
+                    should_trigger = True
+                
+                if should_trigger:
+                    alert.triggered_at = datetime.now()
+                    alert.active = False
+                    self._unwatch(key)
+                    triggered_alerts.append(alert)
+                    logger.info(f"Price alert triggered: {alert.symbol} is {current_price}")
         
         return triggered_alerts
     
     def get_active_alerts(self) -> List[PriceAlert]:
         """Get all active price alerts."""
-        return [alert for alert in self.alerts if alert.active]
-    
-    def remove_alert(self, symbol: str, target_price: float) -> bool:
-        """Remove a specific price alert."""
-        for i, alert in enumerate(self.alerts):
-            if alert.symbol == symbol.upper() and alert.target_price == target_price:
-                del self.alerts[i]
-                return True
-        return False
+        return [alert for alert in self._alerts.values() if alert.active]
+    
+    def remove_alert(self, symbol: str, target_price: float, condition: Optional[str] = None) -> bool:
+        """Remove a specific price alert; without a condition, both directions at that price are removed."""
+        conditions = (condition.lower(),) if condition else ("above", "below")
+        removed = False
+        for alert_condition in conditions:
+            key = (symbol.upper(), target_price, alert_condition)
+            if self._alerts.pop(key, None) is not None:
+                self._unwatch(key)
+                removed = True
+        return removed
 
 class WalletAnalyzer:
     """Advanced wallet analysis and tracking."""
@@ -368,77 +491,119 @@ class WalletAnalyzer:
 class ComprehensiveSecuritySuite:
     """Complete security analysis suite combining all security tools."""
     
-    def __init__(self, goplus_api_key: Optional[str] = None):
-        self.goplus_client = GoPlusLabsClient(goplus_api_key)
-        self.price_monitor = CryptoPriceMonitor()
+    # Security verdicts can change, so cached results expire after 5 minutes
+    CHECK_CACHE_TTL = 300
+    CHECK_CACHE_SIZE = 10000
+    
+    def __init__(self, goplus_api_key: Optional[str] = None, session: Optional[aiohttp.ClientSession] = None):
+        self.goplus_client = GoPlusLabsClient(goplus_api_key, session=session)
+        self.price_monitor = CryptoPriceMonitor(session=session)
         self.wallet_analyzer = WalletAnalyzer()
         
-    async def comprehensive_security_check(self, target: str, target_type: str = "address") -> SecurityResult:
-        """Perform comprehensive security analysis on target."""
+        # LRU check cache: (target, target_type) -> (expires_at, result)
+        self._check_cache: "OrderedDict[Tuple[str, str], Tuple[float, SecurityResult]]" = OrderedDict()
+        
+    async def aclose(self):
+        """Close HTTP sessions owned by the suite's clients."""
+        await self.goplus_client.aclose()
+        await self.price_monitor.aclose()
+    
+    async def comprehensive_security_check(self, target: str, target_type: str = "address", force: bool = False) -> SecurityResult:
+        """Perform comprehensive security analysis on target, reusing recent results unless forced."""
+        key = (target, target_type)
+        if not force:
+            cached = self._check_cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._check_cache.move_to_end(key)
+                return cached[1]
+        
+        result, cacheable = await self._run_security_check(target, target_type)
+        
+        # Only verdicts built from real API payloads are cached; failed lookups are retried
+        if cacheable:
+            self._check_cache[key] = (time.monotonic() + self.CHECK_CACHE_TTL, result)
+            self._check_cache.move_to_end(key)
+            if len(self._check_cache) > self.CHECK_CACHE_SIZE:
+                self._check_cache.popitem(last=False)
+        
+        return result
+    
+    async def _run_security_check(self, target: str, target_type: str) -> Tuple[SecurityResult, bool]:
+        """Run the security checks for target, returning the result and whether every lookup succeeded."""
         checks = {}
         total_checks = 0
         passed_checks = 0
+        cacheable = True
         
         try:
             if target_type == "address":
                 # Address security checks
-                async with self.goplus_client:
-                    address_result = await self.goplus_client.check_address_security(target)
-                    checks["address_security"] = address_result
-                    total_checks += 1
-                    
-                    # Check if address has malicious indicators
-                    malicious_indicators = [
-                        "blacklist_doubt", "blackmail_activities", "cybercrime",
-                        "darkweb_transactions", "financial_crime", "mixer",
-                        "money_laundering", "phishing_activities", "stealing_attack"
-                    ]
+                address_result = await self.goplus_client.check_address_security(target)
+                checks["address_security"] = address_result
+                total_checks += 1
+                cacheable = "error" not in address_result
+                
+                # Check if address has malicious indicators
+                malicious_indicators = [
+                    "blacklist_doubt", "blackmail_activities", "cybercrime",
+                    "darkweb_transactions", "financial_crime", "mixer",
+                    "money_laundering", "phishing_activities", "stealing_attack"
+                ]
+                
+                is_safe = not any(address_result.get(indicator) == "1" for indicator in malicious_indicators)
+                if is_safe:
+                    passed_checks += 1
                     
-                    is_safe = not any(address_result.get(indicator) == "1" for indicator in malicious_indicators)
-                    if is_safe:
-                        passed_checks += 1
-                        
             elif target_type == "token":
                 # Token security analysis
-                async with self.goplus_client:
-                    token_analysis = await self.goplus_client.check_token_security(target)
-                    checks["token_security"] = {
-                        "is_honeypot": token_analysis.is_honeypot,
-                        "can_sell": token_analysis.can_sell,
-                        "buy_tax": token_analysis.buy_tax,
-                        "sell_tax": token_analysis.sell_tax,
-                        "is_proxy": token_analysis.is_proxy,
-                        "is_mintable": token_analysis.is_mintable,
-                        "hidden_owner": token_analysis.hidden_owner
-                    }
-                    total_checks += 1
+                token_analysis = await self.goplus_client._lookup_token_security(target)
+                if token_analysis is None:
+                    # Report the same safe defaults as check_token_security, but don't cache them
+                    cacheable = False
+                    token_analysis = self.goplus_client._default_token_analysis(target)
+                checks["token_security"] = {
+                    "is_honeypot": token_analysis.is_honeypot,
+                    "can_sell": token_analysis.can_sell,
+                    "buy_tax": token_analysis.buy_tax,
+                    "sell_tax": token_analysis.sell_tax,
+                    "is_proxy": token_analysis.is_proxy,
+                    "is_mintable": token_analysis.is_mintable,
+                    "hidden_owner": token_analysis.hidden_owner
+                }
+                total_checks += 1
+                
+                # Token is considered safe if not a honeypot and has reasonable taxes
+                is_safe = (not token_analysis.is_honeypot and 
+                         token_analysis.can_sell and 
+                         token_analysis.buy_tax < 10.0 and 
+                         token_analysis.sell_tax < 10.0)
+                if is_safe:
+                    passed_checks += 1
                     
-                    # Token is considered safe if not a honeypot and has reasonable taxes
-                    is_safe = (not token_analysis.is_honeypot and 
-                             token_analysis.can_sell and 
-                             token_analysis.buy_tax < 10.0 and 
-                             token_analysis.sell_tax < 10.0)
-                    if is_safe:
-                        passed_checks += 1
-                        
             elif target_type == "url":
                 # Website/dApp security checks
-                async with self.goplus_client:
-                    dapp_result = await self.goplus_client.check_dapp_security(target)
-                    phishing_result = await self.goplus_client.check_phishing_site(target)
-                    
-                    checks["dapp_security"] = dapp_result
-                    checks["phishing_check"] = phishing_result
-                    total_checks += 2
-                    
-                    # Website is safe if not flagged as malicious or phishing
-                    dapp_safe = dapp_result.get("malicious_activity") != "1"
-                    phishing_safe = phishing_result.get("phishing_site") != "1"
-                    
-                    if dapp_safe:
-                        passed_checks += 1
-                    if phishing_safe:
-                        passed_checks += 1
+                # The two lookups are independent, so run them concurrently
+                dapp_result, phishing_result = await asyncio.gather(
+                    self.goplus_client._lookup_dapp_security(target),
+                    self.goplus_client._lookup_phishing_site(target)
+                )
+                if dapp_result is None or phishing_result is None:
+                    cacheable = False
+                    dapp_result = dapp_result or {}
+                    phishing_result = phishing_result or {}
+                
+                checks["dapp_security"] = dapp_result
+                checks["phishing_check"] = phishing_result
+                total_checks += 2
+                
+                # Website is safe if not flagged as malicious or phishing
+                dapp_safe = dapp_result.get("malicious_activity") != "1"
+                phishing_safe = phishing_result.get("phishing_site") != "1"
+                
+                if dapp_safe:
+                    passed_checks += 1
+                if phishing_safe:
+                    passed_checks += 1
             
             # Calculate risk level and confidence
             if total_checks == 0:
@@ -465,7 +630,7 @@ class ComprehensiveSecuritySuite:
                 total_checks=total_checks,
                 details=checks,
                 timestamp=datetime.now()
-            )
+            ), cacheable
             
         except Exception as e:
             logger.error(f"Security check failed: {e}")
@@ -477,7 +642,7 @@ class ComprehensiveSecuritySuite:
                 total_checks=1,
                 details={"error": str(e)},
                 timestamp=datetime.now()
-            )
+            ), False
     
     async def monitor_price_alerts(self) -> List[PriceAlert]:
         """Check all price alerts and return triggered ones."""